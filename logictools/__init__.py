@@ -15,3 +15,5 @@ from logictools.cover import Cover
 from logictools.fsm import Fsm
 from logictools.bdd.bdd import Bdd
 from logictools.bdd.bddmgr import BddMgr
+from logictools.zdd.zdd import Zdd
+from logictools.zdd.zddmgr import ZddMgr
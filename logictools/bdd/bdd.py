@@ -9,13 +9,34 @@
 
 from logictools.bdd.dispop import DispOp
 from logictools.bdd.dotgen import DotGen
+from logictools.bdd.satop import SatOp
+from logictools.bdd.nodecollector import NodeCollector
 
 
 class Bdd:
+    """BDD を表すクラス
+
+    実体は BddMgr 中のノードを指す枝(整数)とマネージャの組で，
+    ノードの情報は全て BddMgr が持つ．
+    Bdd が存在する間は根のノードの参照回数が増やされている．
+    """
 
     def __init__(self, mgr, root):
         self._mgr = mgr
         self._root = root
+        if mgr is not None:
+            mgr.store.inc_ref(root)
+
+    def __del__(self):
+        if self._mgr is not None:
+            self._mgr.store.dec_ref(self._root)
+
+    def _set_root(self, root):
+        """根の枝を付け替える．
+        """
+        self._mgr.store.inc_ref(root)
+        self._mgr.store.dec_ref(self._root)
+        self._root = root
 
     @staticmethod
     def invalid():
@@ -26,7 +47,7 @@ class Bdd:
     def __invert__(self):
         """否定する．
         """
-        return Bdd(self._mgr, ~self._root)
+        return Bdd(self._mgr, self._root ^ 1)
 
     def __and__(self, other):
         """論理積を返す．
@@ -41,7 +62,7 @@ class Bdd:
         if not isinstance(other, Bdd):
             raise NotImplementedError
         rbdd = self._mgr.and_op(self, other)
-        self._root = rbdd._root
+        self._set_root(rbdd._root)
         return self
 
     def __or__(self, other):
@@ -57,7 +78,7 @@ class Bdd:
         if not isinstance(other, Bdd):
             raise NotImplementedError
         rbdd = self._mgr.or_op(self, other)
-        self._root = rbdd._root
+        self._set_root(rbdd._root)
         return self
 
     def __xor__(self, other):
@@ -73,7 +94,7 @@ class Bdd:
         if not isinstance(other, Bdd):
             raise NotImplementedError
         rbdd = self._mgr.xor_op(self, other)
-        self._root = rbdd._root
+        self._set_root(rbdd._root)
         return self
 
     def __eq__(self, other):
@@ -92,42 +113,149 @@ class Bdd:
     def is_zero(self):
         if self.is_invalid():
             return False
-        return self._root.is_zero()
+        return self._root == 0
     
     def is_one(self):
         if self.is_invalid():
             return False
-        return self._root.is_one()
+        return self._root == 1
     
     def is_const(self):
         if self.is_invalid():
             return False
-        return self._root.is_const()
+        return self._root <= 1
     
     def root_decomp(self):
         if self.is_invalid():
             return None, None, None
         if self.is_const():
             return None, None, None
-        node = self._root.node
-        inv = self._root.inv
-        edge0 = node.edge0 * inv
-        edge1 = node.edge1 * inv
-        index = node.index
+        store = self._mgr.store
+        node = self._root >> 1
+        inv = self._root & 1
+        edge0 = store.edge0(node) ^ inv
+        edge1 = store.edge1(node) ^ inv
+        index = store.index(node)
         bdd0 = Bdd(self._mgr, edge0)
         bdd1 = Bdd(self._mgr, edge1)
         return index, bdd0, bdd1
 
+    def size(self):
+        """ノード数を返す．
+
+        終端ノードは含まない．
+        """
+        if self.is_invalid():
+            return 0
+        return self._mgr.shared_size([self])
+
+    def support(self):
+        """依存している変数番号のリストを返す．
+
+        リストは変数番号の昇順に並んでいる．
+        """
+        if self.is_invalid():
+            return []
+        nc = NodeCollector(self._mgr)
+        nc.get_node(self._root)
+        return [index for index in range(nc.max_index)
+                if next(nc.indexed_node_list(index), None) is not None]
+
+    def exists(self, var_list):
+        """存在量化した関数を返す．
+
+        :param list[int] var_list: 量化する変数番号のリスト
+        """
+        return self._mgr.exists(self, var_list)
+
+    def forall(self, var_list):
+        """全称量化した関数を返す．
+
+        :param list[int] var_list: 量化する変数番号のリスト
+        """
+        return self._mgr.forall(self, var_list)
+
+    def compose(self, var, g):
+        """変数を関数に置き換えた関数を返す．
+
+        :param int var: 置き換える変数番号
+        :param Bdd g: 置き換える関数
+        """
+        return self._mgr.compose(self, var, g)
+
+    def vector_compose(self, bdd_map):
+        """複数の変数を同時に関数に置き換えた関数を返す．
+
+        :param dict[int, Bdd] bdd_map: 変数番号から置き換える関数への辞書
+        """
+        return self._mgr.vector_compose(self, bdd_map)
+
+    def sat_count(self, nvars=None):
+        """充足する割当の数を返す．
+
+        :param int nvars: 変数の数(省略時はマネージャの変数の数)
+
+        0 から nvars - 1 の変数に関する割当を数える．
+        nvars 以上の番号の変数に依存していてはいけない．
+        """
+        if nvars is None:
+            nvars = self._mgr.var_num
+        op = SatOp(self._mgr)
+        return op.count(self._root, nvars)
+
+    def sat_one(self, nvars=None):
+        """充足する割当を一つ返す．
+
+        :param int nvars: キューブの入力数(省略時はマネージャの変数の数)
+        :return: 充足する割当を表す Cube を返す．
+                 恒偽関数の場合は None を返す．
+
+        返されるキューブは根から 1 の終端に至る一つの経路を表す．
+        """
+        return next(self.iter_sat(nvars), None)
+
+    def iter_sat(self, nvars=None, *, minterm=False):
+        """充足する割当を列挙する．
+
+        :param int nvars: 変数の数(省略時はマネージャの変数の数)
+        :param bool minterm: 最小項を列挙する時 True にするフラグ
+                             (名前付きオプション引数)
+
+        minterm が False の場合は根から 1 の終端に至る経路を Cube で表し，
+        True の場合は各変数の値(0 か 1)のリストで表す．
+        いずれの場合も必要になった時点で一つずつ生成する．
+        列挙の途中でもこの Bdd は参照されたままになっている．
+        """
+        if nvars is None:
+            nvars = self._mgr.var_num
+        op = SatOp(self._mgr)
+        if minterm:
+            yield from op.iter_minterm(self._root, nvars)
+        else:
+            yield from op.iter_sat(self._root, nvars)
+
+    def isop(self, upper=None):
+        """非冗長積和形(ISOP)を返す．
+
+        :param Bdd upper: 上限の関数(省略時は自分自身)
+        :return: キューブのカバー(Cover)を返す．
+
+        自分自身をオンセット，upper をオンセットとドントケアセットの和とし，
+        その間に含まれる関数の非冗長積和形を Minato-Morreale の方法で求める．
+        キューブの入力数はマネージャの変数の数となる．
+        """
+        return self._mgr.isop(self, upper)
+
     def display(self, *, fout=None):
         if self._mgr is None:
             fout.write("--invalid--\n")
         else:
-            op = DispOp(fout=fout)
+            op = DispOp(self._mgr, fout=fout)
             op.display(self._root)
 
     def gen_dot(self, *, attr_dict={}, fout=None):
         if self._mgr is None:
             return
 
-        gen = DotGen(attr_dict=attr_dict, fout=fout)
+        gen = DotGen(self._mgr, attr_dict=attr_dict, fout=fout)
         gen.write(self._root)
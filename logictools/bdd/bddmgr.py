@@ -6,110 +6,403 @@
 :author: Yusuke Matsunaga (松永 裕介)
 :copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
 """
+from logictools.cover import Cover
 from logictools.bdd.bdd import Bdd
-from logictools.bdd.bddedge import BddEdge
-from logictools.bdd.bddnode import BddNode
+from logictools.bdd.nodestore import NodeStore
 from logictools.bdd.truthop import TruthOp
 from logictools.bdd.copyop import CopyOp
+from logictools.bdd.composeop import ComposeOp
+from logictools.bdd.isopop import IsopOp
+from logictools.bdd.dumpop import DumpOp
+from logictools.bdd.loadop import LoadOp
+from logictools.bdd.siftop import SiftOp
+from logictools.bdd.nodecollector import NodeCollector
+from logictools.bdd.computedtable import ComputedTable
+
+
+# 演算結果テーブルのキーに用いる演算の種類
+_ITE_OP = 0
+_AND_EXISTS_OP = 1
 
 
 class BddMgr:
+    """BDD を管理するクラス
+
+    :param int cache_size: 演算結果テーブルのサイズ(名前付きオプション引数)
+    :param int gc_threshold: ガーベージコレクションを起動する dead ノード数
+                             (名前付きオプション引数)
+    :param bool auto_reorder: 自動で変数順の最適化を行う時 True にするフラグ
+                              (名前付きオプション引数)
+    :param int reorder_threshold: 自動で変数順の最適化を起動するノード数
+                                  (名前付きオプション引数)
+
+    演算結果テーブルは全ての演算で共有され，演算をまたがって保持される．
+    AND/OR/XOR などの2項演算は全て ITE 演算で実装されているので，
+    異なる演算の間でもエントリが共有される．
+
+    ノードは NodeStore に格納され，枝は node_id * 2 + 極性 の整数で表す．
+    0 が定数0，1 が定数1を表す．
+
+    Bdd は根のノードを参照しており，どこからも参照されなくなったノードは
+    dead ノードとなる．dead ノード数が gc_threshold を超えると，
+    次の演算の開始時にガーベージコレクションが行われる．
+
+    変数の順序は変数番号とは別にレベルで表す．
+    レベルの小さい変数ほど根に近い．
+    新しい変数は一番下のレベルに追加される．
+    auto_reorder が True の場合，ノード数が reorder_threshold を超えると
+    次の演算の開始時にシフティングによる変数順の最適化が行われる．
+    """
+
+    DEFAULT_CACHE_SIZE = 1 << 16
+    DEFAULT_GC_THRESHOLD = 10000
+    DEFAULT_REORDER_THRESHOLD = 4000
+
+    def __init__(self, *,
+                 cache_size=DEFAULT_CACHE_SIZE,
+                 gc_threshold=DEFAULT_GC_THRESHOLD,
+                 auto_reorder=False,
+                 reorder_threshold=DEFAULT_REORDER_THRESHOLD):
+        self._store = NodeStore()
+        self._computed_table = ComputedTable(cache_size)
+        self._gc_threshold = gc_threshold
+        self._var2level = []
+        self._level2var = []
+        self._auto_reorder = auto_reorder
+        self._reorder_threshold = reorder_threshold
+        self._next_reorder = reorder_threshold
+
+    @property
+    def cache_size(self):
+        """演算結果テーブルのサイズを返す．
+        """
+        return self._computed_table.size
+
+    def set_cache_size(self, size):
+        """演算結果テーブルのサイズを設定する．
+
+        :param int size: サイズ(2のべき乗に切り上げられる)
+
+        それまでの内容は破棄される．
+        """
+        self._computed_table.resize(size)
+
+    @property
+    def computed_table(self):
+        """演算結果テーブルを返す．
+        """
+        return self._computed_table
+
+    @property
+    def gc_threshold(self):
+        """ガーベージコレクションを起動する dead ノード数を返す．
+        """
+        return self._gc_threshold
 
-    def __init__(self):
-        self._node_count = 0
-        self._node_table = {}
-        self._and_table = {}
-        self._or_table = {}
-        self._xor_table = {}
+    def set_gc_threshold(self, threshold):
+        """ガーベージコレクションを起動する dead ノード数を設定する．
+
+        :param int threshold: dead ノード数
+        """
+        self._gc_threshold = threshold
+
+    def garbage_collection(self):
+        """ガーベージコレクションを行う．
+
+        :return: 回収したノード数を返す．
+
+        dead ノードをノードテーブルから取り除き，
+        演算結果テーブルをクリアする．
+        演算の途中で呼んではいけない．
+        """
+        n = self._store.garbage_collection()
+        if n > 0:
+            # dead ノードを指しているエントリが残っている可能性がある．
+            self._computed_table.clear()
+        return n
+
+    @property
+    def dead_num(self):
+        """dead ノード数を返す．
+        """
+        return self._store.dead_num
+
+    @property
+    def var_num(self):
+        """変数の数を返す．
+        """
+        return len(self._var2level)
+
+    def var_to_level(self, var):
+        """変数のレベルを返す．
+
+        :param int var: 変数番号
+        """
+        return self._var2level[var]
+
+    def level_to_var(self, level):
+        """レベルに対応する変数を返す．
+
+        :param int level: レベル
+        """
+        return self._level2var[level]
+
+    @property
+    def var_order(self):
+        """レベルの順に並べた変数のリストを返す．
+        """
+        return list(self._level2var)
+
+    def set_var_order(self, var_list):
+        """変数順を設定する．
+
+        :param list[int] var_list: 上のレベルから順に並べた変数番号のリスト
+
+        var_list に含まれない変数は元の順序のまま var_list の変数の下に置かれる．
+        ノードを作る前に呼ぶのが効率的だが，
+        既にノードがある場合でも隣接レベルの入れ替えで変数順を変更する．
+        """
+        assert len(set(var_list)) == len(var_list)
+        for var in var_list:
+            self._ensure_var(var)
+        self.garbage_collection()
+        op = SiftOp(self)
+        for level, var in enumerate(var_list):
+            cur_level = self._var2level[var]
+            while cur_level > level:
+                op.swap(cur_level - 1)
+                cur_level -= 1
+        self._computed_table.clear()
+
+    def swap_level(self, level):
+        """level と level + 1 の変数を入れ替える．
+
+        :param int level: レベル ( 0 <= level < var_num - 1 )
+        """
+        assert 0 <= level < self.var_num - 1
+        self.garbage_collection()
+        op = SiftOp(self)
+        op.swap(level)
+        self._computed_table.clear()
+
+    def reorder(self, *, max_growth=1.2):
+        """シフティングによって変数順を最適化する．
+
+        :param float max_growth: 一つの変数の移動を打ち切るノード数の増加率
+                                 (名前付きオプション引数)
+        :return: 最適化後のノード数を返す．
+        """
+        self.garbage_collection()
+        op = SiftOp(self)
+        op.sift(max_growth=max_growth)
+        self._computed_table.clear()
+        return self._store.node_num
+
+    @property
+    def auto_reorder(self):
+        """自動で変数順の最適化を行う時 True を返す．
+        """
+        return self._auto_reorder
+
+    def set_auto_reorder(self, flag, *, threshold=None):
+        """自動で変数順の最適化を行うかどうかを設定する．
+
+        :param bool flag: 最適化を行う時 True にするフラグ
+        :param int threshold: 最適化を起動するノード数(名前付きオプション引数)
+        """
+        self._auto_reorder = flag
+        if threshold is not None:
+            self._reorder_threshold = threshold
+        self._next_reorder = max(self._reorder_threshold,
+                                 self._store.node_num)
 
     def copy(self, src):
         """BDDをコピーする．
 
         :param Bdd src: コピー元のBDD
         """
-        if src._mgr != self:
-            edge = self.copy_step(src._root)
-        else:
-            edge = src._root
-        return Bdd(self, edge)
+        self._safe_point()
+        return Bdd(self, self._get_edge(src))
 
     def and_op(self, left, right):
         """AND演算を行う．
         """
-        if self != left._mgr:
-            ledge = self.copy_step(left._root)
-        else:
-            ledge = left._root
-        if self != right._mgr:
-            redge = self.copy_step(right._root)
-        else:
-            redge = right._root
-        self._and_table = {}
+        self._safe_point()
+        ledge = self._get_edge(left)
+        redge = self._get_edge(right)
         edge = self.and_step(ledge, redge)
         return Bdd(self, edge)
 
     def or_op(self, left, right):
         """OR演算を行う．
         """
-        if self != left._mgr:
-            ledge = self.copy_step(left._root)
-        else:
-            ledge = left._root
-        if self != right._mgr:
-            redge = self.copy_step(right._root)
-        else:
-            redge = right._root
-        self._or_table = {}
+        self._safe_point()
+        ledge = self._get_edge(left)
+        redge = self._get_edge(right)
         edge = self.or_step(ledge, redge)
         return Bdd(self, edge)
 
     def xor_op(self, left, right):
         """XOR演算を行う．
         """
-        if self != left._mgr:
-            ledge = self.copy_step(left._root)
-        else:
-            ledge = left._root
-        if self != right._mgr:
-            redge = self.copy_step(right._root)
-        else:
-            redge = right._root
-        self._xor_table = {}
+        self._safe_point()
+        ledge = self._get_edge(left)
+        redge = self._get_edge(right)
         edge = self.xor_step(ledge, redge)
         return Bdd(self, edge)
-    
+
+    def xnor_op(self, left, right):
+        """XNOR演算を行う．
+        """
+        self._safe_point()
+        ledge = self._get_edge(left)
+        redge = self._get_edge(right)
+        edge = self.xnor_step(ledge, redge)
+        return Bdd(self, edge)
+
+    def imp_op(self, left, right):
+        """含意(left → right)演算を行う．
+        """
+        self._safe_point()
+        ledge = self._get_edge(left)
+        redge = self._get_edge(right)
+        edge = self.imp_step(ledge, redge)
+        return Bdd(self, edge)
+
+    def ite(self, f, g, h):
+        """ITE(if-then-else)演算を行う．
+
+        :param Bdd f: 条件
+        :param Bdd g: f が真の時の値
+        :param Bdd h: f が偽の時の値
+        :return: f・g + ~f・h を返す．
+
+        マルチプレクサ(mux)もこの演算で表す．
+        """
+        self._safe_point()
+        fedge = self._get_edge(f)
+        gedge = self._get_edge(g)
+        hedge = self._get_edge(h)
+        edge = self.ite_step(fedge, gedge, hedge)
+        return Bdd(self, edge)
+
+    def exists(self, f, var_list):
+        """存在量化を行う．
+
+        :param Bdd f: 対象の関数
+        :param list[int] var_list: 量化する変数番号のリスト
+        :return: var_list の変数を存在量化した関数を返す．
+        """
+        self._safe_point()
+        fedge = self._get_edge(f)
+        edge = self.and_exists_step(fedge, 1, var_list)
+        return Bdd(self, edge)
+
+    def forall(self, f, var_list):
+        """全称量化を行う．
+
+        :param Bdd f: 対象の関数
+        :param list[int] var_list: 量化する変数番号のリスト
+        :return: var_list の変数を全称量化した関数を返す．
+        """
+        self._safe_point()
+        fedge = self._get_edge(f)
+        edge = self.and_exists_step(fedge ^ 1, 1, var_list) ^ 1
+        return Bdd(self, edge)
+
+    def and_exists(self, f, g, var_list):
+        """f・g を存在量化した関数(relational product)を求める．
+
+        :param Bdd f, g: オペランド
+        :param list[int] var_list: 量化する変数番号のリスト
+        :return: var_list の変数で f・g を存在量化した関数を返す．
+
+        f・g を作らずに直接計算する．
+        """
+        self._safe_point()
+        fedge = self._get_edge(f)
+        gedge = self._get_edge(g)
+        edge = self.and_exists_step(fedge, gedge, var_list)
+        return Bdd(self, edge)
+
+    def compose(self, f, var, g):
+        """変数を関数に置き換える．
+
+        :param Bdd f: 対象の関数
+        :param int var: 置き換える変数番号
+        :param Bdd g: 置き換える関数
+        :return: f の var を g に置き換えた関数を返す．
+        """
+        return self.vector_compose(f, {var: g})
+
+    def vector_compose(self, f, bdd_map):
+        """複数の変数を同時に関数に置き換える．
+
+        :param Bdd f: 対象の関数
+        :param dict[int, Bdd] bdd_map: 変数番号から置き換える関数への辞書
+        :return: f の変数を bdd_map に従って置き換えた関数を返す．
+        """
+        self._safe_point()
+        fedge = self._get_edge(f)
+        edge_map = {var: self._get_edge(g) for var, g in bdd_map.items()}
+        op = ComposeOp(self, edge_map)
+        edge = op.op_step(fedge)
+        return Bdd(self, edge)
+
+    def isop(self, lower, upper=None):
+        """区間 [lower, upper] に含まれる関数の非冗長積和形を求める．
+
+        :param Bdd lower: 下限の関数(オンセット)
+        :param Bdd upper: 上限の関数(オンセット + ドントケアセット)
+                          省略時は lower と同じ
+        :return: キューブのカバー(Cover)を返す．
+        """
+        self._safe_point()
+        ledge = self._get_edge(lower)
+        if upper is None:
+            uedge = ledge
+        else:
+            uedge = self._get_edge(upper)
+        if self.and_step(ledge, uedge ^ 1) != 0:
+            raise ValueError('lower must be contained in upper')
+        op = IsopOp(self)
+        _, cube_list = op.op_step(ledge, uedge)
+        return Cover(op.to_cube_list(cube_list, self.var_num))
+
     def zero(self):
         """恒偽関数を作る．
         """
-        return Bdd(self, BddEdge.zero())
+        return Bdd(self, 0)
 
     def one(self):
         """恒真関数を作る．
         """
-        return Bdd(self, BddEdge.one())
+        return Bdd(self, 1)
 
     def literal(self, var, inv=False):
         """リテラル関数を作る．
         :param int var: 変数番号
         :param bool inv: 反転フラグ
         """
-        edge = self.new_node(var, BddEdge.zero(), BddEdge.one())
-        assert isinstance(edge, BddEdge)
-        return Bdd(self, edge * inv)
+        self._ensure_var(var)
+        edge = self.new_node(var, 0, 1)
+        return Bdd(self, edge ^ int(inv))
 
     def posi_literal(self, var):
         """肯定のリテラル関数を作る．
         :param int var: 変数番号
         """
-        edge = self.new_node(var, BddEdge.zero(), BddEdge.one())
+        self._ensure_var(var)
+        edge = self.new_node(var, 0, 1)
         return Bdd(self, edge)
 
     def nega_literal(self, var):
         """否定のリテラル関数を作る．
         :param int var: 変数番号
         """
-        edge = self.new_node(var, BddEdge.zero(), BddEdge.one())
-        return Bdd(self, edge * True)
+        self._ensure_var(var)
+        edge = self.new_node(var, 0, 1)
+        return Bdd(self, edge ^ 1)
 
     def from_truth(self, truth_str):
         """真理値表形式の文字列からBDDを作る．
@@ -121,147 +414,475 @@ class BddMgr:
         while (1 << ni) < n:
             ni += 1
         assert (1 << ni) == n
+        self._safe_point()
         op = TruthOp(self)
         edge = op.op_step(truth_str, 0)
         return Bdd(self, edge)
 
+    def dump(self, bdd_list, fout, *, var_names=None):
+        """BDD のリストをバイナリ形式で書き出す．
+
+        :param list[Bdd] bdd_list: BDD のリスト
+        :param fout: 出力先のバイナリファイルオブジェクト
+        :param list[str] var_names: 変数名のリスト(名前付きオプション引数)
+
+        共有されているノードは一度だけ書き出される．
+        形式については DumpOp を参照のこと．
+        """
+        edge_list = [self._get_edge(bdd) for bdd in bdd_list]
+        op = DumpOp(self, fout)
+        op.dump(edge_list, var_names)
+
+    def load(self, fin, *, use_mmap=False):
+        """dump() で書き出した BDD のリストを読み込む．
+
+        :param fin: 入力元のバイナリファイルオブジェクト
+        :param bool use_mmap: ファイルを memory map する時 True にするフラグ
+                              (名前付きオプション引数)
+        :return: BDD のリストと変数名のリストのタプルを返す．
+
+        不正な形式の場合には ValueError 例外を送出する．
+        """
+        self._safe_point()
+        op = LoadOp(self)
+        edge_list, var_names = op.load(fin, use_mmap=use_mmap)
+        return [Bdd(self, edge) for edge in edge_list], var_names
+
     @property
     def node_num(self):
         """ノード数を返す．
+
+        終端ノードは含まないが dead ノードは含む．
         """
-        pass
+        return self._store.node_num
+
+    def shared_size(self, bdd_list):
+        """複数の BDD の共有されたノード数を返す．
+
+        :param list[Bdd] bdd_list: BDD のリスト
 
-    def copy_step(self, edge):
-        """コピーする
+        終端ノードは含まない．
         """
-        op = CopyOp(self)
+        nc = NodeCollector(self)
+        for bdd in bdd_list:
+            nc.get_node(self._get_edge(bdd))
+        return nc.node_num
+
+    def level_profile(self, bdd_list=None):
+        """レベルごとのノード数のリストを返す．
+
+        :param list[Bdd] bdd_list: 対象の BDD のリスト
+        :return: レベルをインデックスとするノード数のリストを返す．
+
+        bdd_list を省略した場合はマネージャ中の全てのノード
+        (dead ノードも含む)を対象とする．
+        """
+        if bdd_list is None:
+            return [self._store.index_node_num(var) for var in self._level2var]
+        nc = NodeCollector(self)
+        for bdd in bdd_list:
+            nc.get_node(self._get_edge(bdd))
+        profile = [0 for _ in range(self.var_num)]
+        for node in nc.node_list:
+            profile[self._var2level[self._store.index(node)]] += 1
+        return profile
+
+    @property
+    def store(self):
+        """ノードを格納している NodeStore を返す．
+        """
+        return self._store
+
+    def copy_step(self, src_mgr, edge):
+        """他のマネージャの枝をコピーする
+        """
+        op = CopyOp(self, src_mgr)
         return op.op_step(edge)
 
     def and_step(self, left, right):
         """ANDを計算する．
         """
-
-        if left.is_zero():
-            return BddEdge.zero()
-        if right.is_zero():
-            return BddEdge.zero()
-        if left.is_one():
-            return right
-        if right.is_one():
-            return left
-        if left == right:
-            return left
-        if left.node == right.node:
-            # ということは極性違い
-            return BddEdge.zero()
-        key = left, right
-        if key in self._and_table:
-            return self._and_table[key]
-        top, l0, l1, r0, r1 = BddMgr.decomp(left, right)
-        e0 = self.and_step(l0, r0)
-        e1 = self.and_step(l1, r1)
-        result = self.new_node(top, e0, e1)
-        self._and_table[key] = result
-        return result
+        return self.ite_step(left, right, 0)
 
     def or_step(self, left, right):
         """ORを計算する．
         """
-
-        if left.is_one():
-            return BddEdge.one()
-        if right.is_one():
-            return BddEdge.one()
-        if left.is_zero():
-            return right
-        if right.is_zero():
-            return left
-        if left == right:
-            return left
-        if left.node == right.node:
-            # ということは極性違い
-            return BddEdge.one()
-        key = left, right
-        if key in self._or_table:
-            return self._or_table[key]
-        top, l0, l1, r0, r1 = BddMgr.decomp(left, right)
-        e0 = self.or_step(l0, r0)
-        e1 = self.or_step(l1, r1)
-        result = self.new_node(top, e0, e1)
-        self._or_table[key] = result
-        return result
+        return self.ite_step(left, 1, right)
 
     def xor_step(self, left, right):
         """XORを計算する．
         """
+        return self.ite_step(left, right ^ 1, right)
+
+    def xnor_step(self, left, right):
+        """XNORを計算する．
+        """
+        return self.ite_step(left, right, right ^ 1)
+
+    def imp_step(self, left, right):
+        """含意(left → right)を計算する．
+        """
+        return self.ite_step(left, right, 1)
+
+    def ite_step(self, f, g, h):
+        """ITE(if-then-else)演算を行う．
+
+        :param int f, g, h: オペランドの枝
+        :return: f・g + ~f・h を表す枝を返す．
+
+        全ての2項演算はこの演算で表されるので，演算結果テーブルを共有する．
+        キャッシュに登録する前に (f, g, h) を標準形(standard triple)に
+        正規化するので，同じ関数を表す異なる呼び出しは同じエントリを用いる．
+        - 対称な演算では根のレベル(同じ場合はノード番号)の小さい方を f にする．
+        - f と g は正極性にし，g の極性は結果の極性として外に出す．
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        task_stack の要素は
+        - (None, f, g, h): ITE(f, g, h) の計算を行う．
+        - (key, top, oinv, None): 子供の結果から top のノードを作る．
+        のいずれかで，結果は val_stack に積まれる．
+        """
+        var2level = self._var2level
+        store = self._store
+        index_array = store._index_array
+        edge0_array = store._edge0_array
+        edge1_array = store._edge1_array
+        cache_get = self._computed_table.get
+        cache_put = self._computed_table.put
+        new_node = self.new_node
+        const_level = len(var2level)
+
+        def level(edge):
+            if edge <= 1:
+                return const_level
+            return var2level[index_array[edge >> 1]]
+
+        def less(a, b):
+            # a の方が標準形の f としてふさわしい時 True を返す．
+            alevel = level(a)
+            blevel = level(b)
+            if alevel != blevel:
+                return alevel < blevel
+            return (a >> 1) < (b >> 1)
+
+        task_stack = [(None, f, g, h)]
+        val_stack = []
+        while task_stack:
+            key, f, g, h = task_stack.pop()
+            if key is not None:
+                # この場合 f は top，g は oinv を表す．
+                e1 = val_stack.pop()
+                e0 = val_stack.pop()
+                result = new_node(f, e0, e1)
+                cache_put(key, result)
+                val_stack.append(result ^ g)
+                continue
+
+            # 終端条件
+            if f == 1:
+                val_stack.append(g)
+                continue
+            if f == 0:
+                val_stack.append(h)
+                continue
+            # f と同じ(もしくは反転した)関数を定数に置き換える．
+            if g == f:
+                g = 1
+            elif g == f ^ 1:
+                g = 0
+            if h == f:
+                h = 0
+            elif h == f ^ 1:
+                h = 1
+            if g == h:
+                val_stack.append(g)
+                continue
+            if g == 1 and h == 0:
+                val_stack.append(f)
+                continue
+            if g == 0 and h == 1:
+                val_stack.append(f ^ 1)
+                continue
+
+            # 対称な場合は引数を入れ替えて標準形にする．
+            if g == 1:
+                # f + h
+                if less(h, f):
+                    f, h = h, f
+            elif h == 0:
+                # f・g
+                if less(g, f):
+                    f, g = g, f
+            elif h == 1:
+                # ~f + g = ~g → ~f
+                if less(g, f):
+                    f, g = g ^ 1, f ^ 1
+            elif g == 0:
+                # ~f・h = ~h・~f
+                if less(h, f):
+                    f, h = h ^ 1, f ^ 1
+            elif g == h ^ 1:
+                # f XNOR g
+                if less(g, f):
+                    f, g, h = g, f, f ^ 1
+
+            # 極性を正規化する．
+            if f & 1:
+                f ^= 1
+                g, h = h, g
+            oinv = g & 1
+            if oinv:
+                g ^= 1
+                h ^= 1
+
+            key = _ITE_OP, f, g, h
+            result = cache_get(key)
+            if result is not None:
+                val_stack.append(result ^ oinv)
+                continue
+
+            # 最上位の変数で分解する．
+            flevel = level(f)
+            glevel = level(g)
+            hlevel = level(h)
+            top_level = min(flevel, glevel, hlevel)
+            if flevel == top_level:
+                fnode = f >> 1
+                f0 = edge0_array[fnode]
+                f1 = edge1_array[fnode]
+            else:
+                f0 = f1 = f
+            if glevel == top_level:
+                gnode = g >> 1
+                g0 = edge0_array[gnode]
+                g1 = edge1_array[gnode]
+            else:
+                g0 = g1 = g
+            if hlevel == top_level:
+                hnode = h >> 1
+                hinv = h & 1
+                h0 = edge0_array[hnode] ^ hinv
+                h1 = edge1_array[hnode] ^ hinv
+            else:
+                h0 = h1 = h
+            top = self._level2var[top_level]
+            task_stack.append((key, top, oinv, None))
+            task_stack.append((None, f1, g1, h1))
+            task_stack.append((None, f0, g0, h0))
+        return val_stack[0]
+
+    def and_exists_step(self, f, g, var_list):
+        """f・g を var_list の変数で存在量化した枝を求める．
+
+        :param int f, g: オペランドの枝
+        :param list[int] var_list: 量化する変数番号のリスト
+
+        g を定数1にすれば f の存在量化になり，同じ演算結果テーブルを用いる．
+        量化する変数が最上位の場合は 0 側の結果が定数1なら
+        1 側の計算を省略する．
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        task_stack の要素は
+        - (None, f, g): f と g の計算を行う．
+        - (key, top, f1, g1): 0 側の結果を見て 1 側の計算を行う．
+        - (key, top, None, None): 子供の結果から top のノードを作る．
+        のいずれかで，結果は val_stack に積まれる．
+        """
+        var2level = self._var2level
+        var_set = frozenset(var for var in var_list
+                            if var < len(var2level))
+        if not var_set:
+            return self.and_step(f, g)
+        max_level = max(var2level[var] for var in var_set)
+        store = self._store
+        index_array = store._index_array
+        edge0_array = store._edge0_array
+        edge1_array = store._edge1_array
+        cache_get = self._computed_table.get
+        cache_put = self._computed_table.put
+        const_level = len(var2level)
+
+        def level(edge):
+            if edge <= 1:
+                return const_level
+            return var2level[index_array[edge >> 1]]
+
+        task_stack = [(None, f, g)]
+        val_stack = []
+        while task_stack:
+            task = task_stack.pop()
+            key = task[0]
+            if key is not None:
+                _, top, f1, g1 = task
+                if f1 is not None:
+                    # 量化する変数の 0 側の結果が出たところ．
+                    if val_stack[-1] == 1:
+                        cache_put(key, 1)
+                        continue
+                    task_stack.append((key, top, None, None))
+                    task_stack.append((None, f1, g1))
+                    continue
+                e1 = val_stack.pop()
+                e0 = val_stack.pop()
+                if top in var_set:
+                    result = self.or_step(e0, e1)
+                else:
+                    result = self.new_node(top, e0, e1)
+                cache_put(key, result)
+                val_stack.append(result)
+                continue
+
+            _, f, g = task
+            # 終端条件
+            if f == 0 or g == 0 or f ^ g == 1:
+                val_stack.append(0)
+                continue
+            if f == 1 and g == 1:
+                val_stack.append(1)
+                continue
+            if f == g:
+                g = 1
+            if f > g:
+                # 交換則が成り立つのでキーを正規化しておく．
+                f, g = g, f
+            flevel = level(f)
+            glevel = level(g)
+            top_level = min(flevel, glevel)
+            if top_level > max_level:
+                # 量化する変数を含まない．
+                val_stack.append(self.and_step(f, g))
+                continue
+
+            key = _AND_EXISTS_OP, f, g, var_set
+            result = cache_get(key)
+            if result is not None:
+                val_stack.append(result)
+                continue
+
+            # 最上位の変数で分解する．
+            if flevel == top_level:
+                fnode = f >> 1
+                finv = f & 1
+                f0 = edge0_array[fnode] ^ finv
+                f1 = edge1_array[fnode] ^ finv
+            else:
+                f0 = f1 = f
+            if glevel == top_level:
+                gnode = g >> 1
+                ginv = g & 1
+                g0 = edge0_array[gnode] ^ ginv
+                g1 = edge1_array[gnode] ^ ginv
+            else:
+                g0 = g1 = g
+            top = self._level2var[top_level]
+            if top in var_set:
+                task_stack.append((key, top, f1, g1))
+                task_stack.append((None, f0, g0))
+            else:
+                task_stack.append((key, top, None, None))
+                task_stack.append((None, f1, g1))
+                task_stack.append((None, f0, g0))
+        return val_stack[0]
 
-        if left.is_one():
-            return ~right
-        if right.is_one():
-            return ~left
-        if left.is_zero():
-            return right
-        if right.is_zero():
-            return left
-        if left == right:
-            return BddEdge.zero()
-        if left.node == right.node:
-            # ということは極性違い
-            return BddEdge.one()
-        key = left, right
-        if key in self._xor_table:
-            return self._xor_table[key]
-        top, l0, l1, r0, r1 = BddMgr.decomp(left, right)
-        e0 = self.xor_step(l0, r0)
-        e1 = self.xor_step(l1, r1)
-        result = self.new_node(top, e0, e1)
-        self._xor_table[key] = result
-        return result
-    
     def new_node(self, index, edge0, edge1):
         """ノードを生成する
         """
         if edge0 == edge1:
             return edge0
         # 極性を正規化する．
-        oinv = edge0.inv
-        edge0 *= oinv
-        edge1 *= oinv
-
-        # ノードテーブルを探す．
-        key = (index, edge0, edge1)
-        if key in self._node_table:
-            return BddEdge(self._node_table[key], oinv)
-        # なかったので作る．
-        id = self._node_count
-        self._node_count += 1
-        node = BddNode(id, index, edge0, edge1)
-        self._node_table[key] = node
-        return BddEdge(node, oinv)
-
-    @staticmethod
-    def decomp(left, right):
+        oinv = edge0 & 1
+        return self._store.new_node(index, edge0 ^ oinv, edge1 ^ oinv) | oinv
+
+    def decomp(self, left, right):
         """最上位の変数で分解する
         """
-        assert not left.is_const()
-        assert not right.is_const()
-
-        lnode = left.node
-        lindex = lnode.index
-        linv = left.inv
-        rnode = right.node
-        rindex = rnode.index
-        rinv = right.inv
-        top = min(lindex, rindex)
-        if top == lindex:
-            l0 = lnode.edge0 * linv
-            l1 = lnode.edge1 * linv
+        assert left > 1
+        assert right > 1
+
+        store = self._store
+        lnode = left >> 1
+        lindex = store._index_array[lnode]
+        llevel = self._var2level[lindex]
+        rnode = right >> 1
+        rindex = store._index_array[rnode]
+        rlevel = self._var2level[rindex]
+        if llevel <= rlevel:
+            top = lindex
+            linv = left & 1
+            l0 = store._edge0_array[lnode] ^ linv
+            l1 = store._edge1_array[lnode] ^ linv
         else:
+            top = rindex
             l0 = l1 = left
-        if top == rindex:
-            r0 = rnode.edge0 * rinv
-            r1 = rnode.edge1 * rinv
+        if rlevel <= llevel:
+            rinv = right & 1
+            r0 = store._edge0_array[rnode] ^ rinv
+            r1 = store._edge1_array[rnode] ^ rinv
         else:
             r0 = r1 = right
         return top, l0, l1, r0, r1
 
+    def mux_step(self, var, edge0, edge1):
+        """変数 var の値に応じて edge0 か edge1 を選ぶ関数を作る．
+
+        変数 var が edge0, edge1 の根よりも上のレベルにあれば
+        そのままノードを作るが，そうでなければ論理演算で作る．
+        """
+        self._ensure_var(var)
+        level = self._var2level[var]
+        if self.edge_level(edge0) > level and self.edge_level(edge1) > level:
+            return self.new_node(var, edge0, edge1)
+        lit = self.new_node(var, 0, 1)
+        return self.ite_step(lit, edge1, edge0)
+
+    def edge_level(self, edge):
+        """枝の根のレベルを返す．
+
+        定数の場合は全ての変数よりも大きな値を返す．
+        """
+        if edge <= 1:
+            return len(self._var2level)
+        return self._var2level[self._store._index_array[edge >> 1]]
+
+    def _safe_point(self):
+        """必要ならガーベージコレクションと変数順の最適化を行う．
+
+        演算の開始時に呼ばれる．
+        この時点では全ての有効な枝は Bdd から参照されている．
+        """
+        if self._store.dead_num >= self._gc_threshold:
+            self.garbage_collection()
+        if self._auto_reorder and self._store.node_num >= self._next_reorder:
+            size = self.reorder()
+            # 次はノード数が倍になるまで行わない．
+            self._next_reorder = max(self._reorder_threshold, size * 2)
+
+    def _ensure_var(self, var):
+        """変数 var が登録されていなければ一番下のレベルに追加する．
+
+        :param int var: 変数番号
+        """
+        while len(self._var2level) <= var:
+            self._var2level.append(len(self._level2var))
+            self._level2var.append(len(self._var2level) - 1)
+
+    def _swap_var_level(self, level):
+        """level と level + 1 の変数のレベルを入れ替える．
+
+        ノードの書き換えは SiftOp が行う．
+        """
+        x = self._level2var[level]
+        y = self._level2var[level + 1]
+        self._level2var[level] = y
+        self._level2var[level + 1] = x
+        self._var2level[x] = level + 1
+        self._var2level[y] = level
+
+    def _get_edge(self, bdd):
+        """bdd の根の枝を返す．
+
+        他のマネージャの BDD の場合にはコピーを行う．
+        """
+        if bdd._mgr is self:
+            return bdd._root
+        return self.copy_step(bdd._mgr, bdd._root)
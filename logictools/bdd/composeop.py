@@ -0,0 +1,75 @@
+#! /usr/bin/env python3
+
+"""ComposeOp の実装ファイル
+
+:file: composeop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+
+class ComposeOp:
+    """変数を関数に置き換える(compose)演算を行うクラス
+
+    :param BddMgr mgr: 対象のマネージャ
+    :param dict[int, int] edge_map: 変数番号から置き換える関数の枝への辞書
+
+    全ての変数は同時に置き換えられる．
+    演算結果はこのオブジェクトの持つ専用のテーブルに記録されるので，
+    同じ置き換えを複数の関数に適用する場合は同じオブジェクトを用いると
+    共通部分の計算が省略される．
+    """
+
+    def __init__(self, mgr, edge_map):
+        self._mgr = mgr
+        self._edge_map = dict(edge_map)
+        # 置き換える変数の最大のレベル
+        # これより下のノードは変化しない．
+        self._max_level = max((mgr.var_to_level(var) for var in edge_map
+                               if var < mgr.var_num), default=-1)
+        self._table = {}
+
+    def op_step(self, edge):
+        """edge の指す関数に置き換えを適用する．
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        """
+        mgr = self._mgr
+        if mgr.edge_level(edge) > self._max_level:
+            # 置き換える変数を含まない．
+            return edge
+        table = self._table
+        store = mgr.store
+        stack = [edge >> 1]
+        while stack:
+            node = stack[-1]
+            if node in table:
+                stack.pop()
+                continue
+            edge0 = store.edge0(node)
+            edge1 = store.edge1(node)
+            node0 = edge0 >> 1
+            node1 = edge1 >> 1
+            check0 = mgr.edge_level(edge0) <= self._max_level
+            check1 = mgr.edge_level(edge1) <= self._max_level
+            pending = False
+            if check1 and node1 not in table:
+                stack.append(node1)
+                pending = True
+            if check0 and node0 not in table:
+                stack.append(node0)
+                pending = True
+            if pending:
+                # 子供の処理が終わってから処理する．
+                continue
+            stack.pop()
+            if check0:
+                edge0 = table[node0] ^ (edge0 & 1)
+            if check1:
+                edge1 = table[node1] ^ (edge1 & 1)
+            index = store.index(node)
+            if index in self._edge_map:
+                table[node] = mgr.ite_step(self._edge_map[index], edge1, edge0)
+            else:
+                table[node] = mgr.mux_step(index, edge0, edge1)
+        return table[edge >> 1] ^ (edge & 1)
@@ -0,0 +1,90 @@
+#! /usr/bin/env python3
+
+"""ComputedTable の実装ファイル
+
+:file: computedtable.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+
+class ComputedTable:
+    """演算結果を保持するキャッシュ
+
+    固定サイズのハッシュ表で，衝突した場合には古いエントリを上書きする
+    (lossy キャッシュ)．
+    そのため，サイズを超えて記憶領域が増えることはない．
+    キーは演算の種類を含むタプルとする．
+
+    :param int size: エントリ数(2のべき乗に切り上げられる)
+    """
+
+    def __init__(self, size):
+        self.resize(size)
+
+    def resize(self, size):
+        """サイズを変更する．
+
+        :param int size: エントリ数(2のべき乗に切り上げられる)
+
+        内容はクリアされる．
+        """
+        assert size > 0
+        n = 1
+        while n < size:
+            n <<= 1
+        self._size = n
+        self._mask = n - 1
+        self._key_array = [None] * n
+        self._val_array = [None] * n
+        self._find_num = 0
+        self._hit_num = 0
+
+    def clear(self):
+        """内容をクリアする．
+        """
+        self._key_array = [None] * self._size
+        self._val_array = [None] * self._size
+
+    def get(self, key):
+        """キーに対応する値を返す．
+
+        :param tuple key: キー
+        :return: 対応する値を返す．見つからなければ None を返す．
+        """
+        self._find_num += 1
+        pos = hash(key) & self._mask
+        if self._key_array[pos] == key:
+            self._hit_num += 1
+            return self._val_array[pos]
+        return None
+
+    def put(self, key, val):
+        """値を登録する．
+
+        :param tuple key: キー
+        :param val: 値
+
+        同じ位置に別のエントリがあった場合には上書きする．
+        """
+        pos = hash(key) & self._mask
+        self._key_array[pos] = key
+        self._val_array[pos] = val
+
+    @property
+    def size(self):
+        """サイズを返す．
+        """
+        return self._size
+
+    @property
+    def find_num(self):
+        """検索回数を返す．
+        """
+        return self._find_num
+
+    @property
+    def hit_num(self):
+        """ヒット回数を返す．
+        """
+        return self._hit_num
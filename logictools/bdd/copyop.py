@@ -7,28 +7,56 @@
 :copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
 """
 
-from logictools.bdd.bddedge import BddEdge
 
 
 class CopyOp:
+    """他のマネージャの BDD をコピーするクラス
 
-    def __init__(self, mgr):
+    :param BddMgr mgr: コピー先のマネージャ
+    :param BddMgr src_mgr: コピー元のマネージャ
+
+    二つのマネージャの変数順は異なっていてもよい．
+    """
+
+    def __init__(self, mgr, src_mgr):
         self._mgr = mgr
+        self._src_store = src_mgr.store
         self._table = {}
 
     def op_step(self, edge):
-        if edge.is_const():
+        """edge の指すグラフをコピーする．
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        """
+        if edge <= 1:
             # 定数ならそのまま返す．
             return edge
-        if edge in self._table:
-            return self._table[edge]
-        node = edge.node
-        inv = edge.inv
-        index = node.index
-        edge0 = self.op_step(node.edge0)
-        edge1 = self.op_step(node.edge1)
-        result = self._mgr.new_node(index, edge0, edge1)
-        result *= inv
-        self._table[edge] = result
-        return result
-        
+        table = self._table
+        store = self._src_store
+        stack = [edge >> 1]
+        while stack:
+            node = stack[-1]
+            if node in table:
+                stack.pop()
+                continue
+            edge0 = store.edge0(node)
+            edge1 = store.edge1(node)
+            node0 = edge0 >> 1
+            node1 = edge1 >> 1
+            pending = False
+            if node1 != 0 and node1 not in table:
+                stack.append(node1)
+                pending = True
+            if node0 != 0 and node0 not in table:
+                stack.append(node0)
+                pending = True
+            if pending:
+                # 子供のコピーが終わってから処理する．
+                continue
+            stack.pop()
+            if node0 != 0:
+                edge0 = table[node0] ^ (edge0 & 1)
+            if node1 != 0:
+                edge1 = table[node1] ^ (edge1 & 1)
+            table[node] = self._mgr.mux_step(store.index(node), edge0, edge1)
+        return table[edge >> 1] ^ (edge & 1)
@@ -8,19 +8,19 @@
 """
 
 import sys
-from logictools.bdd.bddedge import BddEdge
 from logictools.bdd.nodecollector import NodeCollector
 
 
 class DispOp(NodeCollector):
 
-    def __init__(self, *, fout=None):
+    def __init__(self, mgr, *, fout=None):
+        super().__init__(mgr)
         if fout is None:
             fout = sys.stdout
         self._fout = fout
 
     def display(self, edge_list):
-        if isinstance(edge_list, BddEdge):
+        if isinstance(edge_list, int):
             edge_list = [edge_list]
         
         for edge in edge_list:
@@ -31,24 +31,25 @@ class DispOp(NodeCollector):
             self.disp_edge(edge)
             self._fout.write('\n')
 
+        store = self._store
         for node in self.node_list:
-            self._fout.write("Node#{:3d}: L{:2d}: ".format(node.id, node.index))
-            self.disp_edge(node.edge0)
+            self._fout.write("Node#{:3d}: L{:2d}: ".format(node, store.index(node)))
+            self.disp_edge(store.edge0(node))
             self._fout.write(": ")
-            self.disp_edge(node.edge1)
+            self.disp_edge(store.edge1(node))
             self._fout.write('\n')
 
     def disp_edge(self, edge):
-        if edge.is_zero():
+        if edge == 0:
             self._fout.write("ZERO")
-        elif edge.is_one():
+        elif edge == 1:
             self._fout.write(" ONE")
         else:
-            node = edge.node
-            inv = edge.inv
+            node = edge >> 1
+            inv = edge & 1
             if inv:
                 inv_char = "~"
             else:
                 inv_char = " "
-            self._fout.write("{:1}{:3d}".format(inv_char, node.id))
+            self._fout.write("{:1}{:3d}".format(inv_char, node))
             
@@ -8,14 +8,13 @@
 """
 
 import sys
-from logictools.bdd.bddedge import BddEdge
 from logictools.bdd.nodecollector import NodeCollector
 
 
 class DotGen(NodeCollector):
 
-    def __init__(self, *, attr_dict={}, fout=None):
-        super().__init__()
+    def __init__(self, mgr, *, attr_dict={}, fout=None):
+        super().__init__(mgr)
         if fout is None:
             fout = sys.stdout
         self._fout = fout
@@ -62,7 +61,7 @@ class DotGen(NodeCollector):
         self._attr_str = ""
         
     def write(self, root_list):
-        if isinstance(root_list, BddEdge):
+        if isinstance(root_list, int):
             root_list = [root_list]
 
         for edge in root_list:
@@ -85,10 +84,11 @@ class DotGen(NodeCollector):
             self._attr_end()
 
         # ノードの定義
+        store = self._store
         for node in self.node_list:
-            self._fout.write("  node{}".format(node.id))
+            self._fout.write("  node{}".format(node))
             self._attr_begin()
-            label = '"{}"'.format(node.index)
+            label = '"{}"'.format(store.index(node))
             self._attr_add("label", label);
             self._attr_add_list(self._node_attr)
             self._attr_end()
@@ -104,10 +104,10 @@ class DotGen(NodeCollector):
 
         # 枝の定義
         for node in self.node_list:
-            self._fout.write("  node{}".format(node.id))
-            self._write_edge(node.edge0, True)
-            self._fout.write("  node{}".format(node.id))
-            self._write_edge(node.edge1, False)
+            self._fout.write("  node{}".format(node))
+            self._write_edge(store.edge0(node), True)
+            self._fout.write("  node{}".format(node))
+            self._write_edge(store.edge1(node), False)
 
         # 根のランクの設定
         self._fout.write("  { rank = same;")
@@ -119,7 +119,7 @@ class DotGen(NodeCollector):
         for i in range(self.max_index):
             self._fout.write("  { rank = same;")
             for node in self.indexed_node_list(i):
-                self._fout.write(" node{};".format(node.id))
+                self._fout.write(" node{};".format(node))
             self._fout.write("}\n")
 
         # dot の終了
@@ -139,14 +139,14 @@ class DotGen(NodeCollector):
     def _write_edge(self, edge, zero):
         self._fout.write(" -> ")
         inv = False
-        if edge.is_zero():
+        if edge == 0:
             self._fout.write("const0")
-        elif edge.is_one():
+        elif edge == 1:
             self._fout.write("const1")
         else:
-            inv = edge.inv
-            node = edge.node
-            self._fout.write("node{}".format(node.id))
+            inv = edge & 1
+            node = edge >> 1
+            self._fout.write("node{}".format(node))
 
         self._attr_begin()
         self._attr_add_list(self._edge_attr)
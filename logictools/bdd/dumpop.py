@@ -0,0 +1,99 @@
+#! /usr/bin/env python3
+
+"""DumpOp の実装ファイル
+
+:file: dumpop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+import sys
+import struct
+from array import array
+from logictools.bdd.nodecollector import NodeCollector
+
+
+# バイナリ形式の識別子
+MAGIC = b'LTBD'
+
+# バイナリ形式のバージョン
+VERSION = 1
+
+# ヘッダの形式
+# (識別子, バージョン, 変数の数, ノード数, 根の数, 変数名の数)
+HEADER = struct.Struct('<4sIIIII')
+
+
+def to_le(data):
+    """array('i') をリトルエンディアンに変換する．
+
+    元の array を書き換える．
+    """
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+
+class DumpOp(NodeCollector):
+    """BDD のフォレストをバイナリ形式で書き出すクラス
+
+    :param BddMgr mgr: 対象のマネージャ
+    :param fout: 出力先のバイナリファイルオブジェクト
+
+    形式は以下の通りで，整数は全て 4 バイトのリトルエンディアンで表す．
+    - ヘッダ(HEADER)
+    - 変数順: レベルの順に並べた変数番号(変数の数)
+    - 根: 根の枝(根の数)
+    - ノード: (変数番号, 0枝, 1枝) の組(ノード数)
+    - 変数名: バイト長と UTF-8 の文字列の組(変数名の数)
+
+    ノードは子供が親よりも先に現れる順(レベルの降順)に並べる．
+    枝は (ノード配列中の位置 + 1) * 2 + 極性 で表すので，
+    0 が定数0，1 が定数1を表す．
+    ノードの部分までは 4 バイト境界に揃っているので，
+    読み込み時にはノード配列をそのまま memory map して使うことができる．
+    """
+
+    def __init__(self, mgr, fout):
+        super().__init__(mgr)
+        self._mgr = mgr
+        self._fout = fout
+
+    def dump(self, edge_list, var_names=None):
+        """edge_list を根とするフォレストを書き出す．
+
+        :param list[int] edge_list: 根の枝のリスト
+        :param list[str] var_names: 変数名のリスト
+        """
+        mgr = self._mgr
+        store = self._store
+        for edge in edge_list:
+            self.get_node(edge)
+        node_list = sorted(self.node_list,
+                           key=lambda node: mgr.var_to_level(store.index(node)),
+                           reverse=True)
+        pos_map = {node: i + 1 for i, node in enumerate(node_list)}
+
+        def local_edge(edge):
+            if edge <= 1:
+                return edge
+            return pos_map[edge >> 1] * 2 + (edge & 1)
+
+        if var_names is None:
+            var_names = []
+        fout = self._fout
+        fout.write(HEADER.pack(MAGIC, VERSION, mgr.var_num, len(node_list),
+                               len(edge_list), len(var_names)))
+        fout.write(to_le(array('i', mgr.var_order)).tobytes())
+        fout.write(to_le(array('i', [local_edge(edge)
+                                     for edge in edge_list])).tobytes())
+        node_array = array('i')
+        for node in node_list:
+            node_array.append(store.index(node))
+            node_array.append(local_edge(store.edge0(node)))
+            node_array.append(local_edge(store.edge1(node)))
+        fout.write(to_le(node_array).tobytes())
+        for name in var_names:
+            data = name.encode('utf-8')
+            fout.write(struct.pack('<I', len(data)))
+            fout.write(data)
@@ -0,0 +1,106 @@
+#! /usr/bin/env python3
+
+"""IsopOp の実装ファイル
+
+:file: isopop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+from logictools.bool3 import Bool3
+from logictools.cube import Cube
+
+
+class IsopOp:
+    """非冗長積和形(ISOP)を求めるクラス
+
+    :param BddMgr mgr: 対象のマネージャ
+
+    Minato と Morreale の方法で，区間 [L, U] に含まれる関数の
+    非冗長積和形を求める．
+    最上位の変数を x とすると
+    - C0 = ISOP(L0・~U1, U0)
+    - C1 = ISOP(L1・~U0, U1)
+    - Cd = ISOP(L0・~f(C0) + L1・~f(C1), U0・U1)
+    として ~x・C0 + x・C1 + Cd を返す(f(C) は C の表す関数)．
+    キューブは (変数番号, 値) のタプルで表し，
+    最後に Cube に変換する．
+    """
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+        # (L, U) から (関数の枝, キューブのリスト) への辞書
+        self._table = {}
+
+    def op_step(self, lower, upper):
+        """区間 [lower, upper] の非冗長積和形を求める．
+
+        :param int lower: 下限の関数の枝
+        :param int upper: 上限の関数の枝
+        :return: 関数の枝とキューブのリストのタプルを返す．
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        task_stack の要素は
+        - (0, L, U): ISOP(L, U) の計算を行う．
+        - (1, L, U, top, l0, l1, u0, u1): C0, C1 から Cd の計算を行う．
+        - (2, L, U, top, f0, c0, f1, c1): Cd から結果を作る．
+        のいずれかで，結果は val_stack に積まれる．
+        """
+        mgr = self._mgr
+        table = self._table
+        task_stack = [(0, lower, upper)]
+        val_stack = []
+        while task_stack:
+            task = task_stack.pop()
+            stage = task[0]
+            if stage == 0:
+                _, l, u = task
+                # 終端条件
+                if l == 0:
+                    val_stack.append((0, []))
+                    continue
+                if u == 1:
+                    val_stack.append((1, [()]))
+                    continue
+                result = table.get((l, u))
+                if result is not None:
+                    val_stack.append(result)
+                    continue
+                top, l0, l1, u0, u1 = mgr.decomp(l, u)
+                task_stack.append((1, l, u, top, l0, l1, u0, u1))
+                task_stack.append((0, mgr.and_step(l1, u0 ^ 1), u1))
+                task_stack.append((0, mgr.and_step(l0, u1 ^ 1), u0))
+            elif stage == 1:
+                _, l, u, top, l0, l1, u0, u1 = task
+                f1, c1 = val_stack.pop()
+                f0, c0 = val_stack.pop()
+                ld = mgr.or_step(mgr.and_step(l0, f0 ^ 1),
+                                 mgr.and_step(l1, f1 ^ 1))
+                ud = mgr.and_step(u0, u1)
+                task_stack.append((2, l, u, top, f0, c0, f1, c1))
+                task_stack.append((0, ld, ud))
+            else:
+                _, l, u, top, f0, c0, f1, c1 = task
+                fd, cd = val_stack.pop()
+                f = mgr.or_step(mgr.mux_step(top, f0, f1), fd)
+                cube_list = [((top, 0),) + cube for cube in c0]
+                cube_list += [((top, 1),) + cube for cube in c1]
+                cube_list += cd
+                result = f, cube_list
+                table[(l, u)] = result
+                val_stack.append(result)
+        return val_stack[0]
+
+    def to_cube_list(self, cube_list, input_num):
+        """op_step() の結果のキューブを Cube に変換する．
+
+        :param cube_list: op_step() の結果のキューブのリスト
+        :param int input_num: 入力数
+        """
+        ans = []
+        for cube in cube_list:
+            lits = [Bool3._d] * input_num
+            for var, val in cube:
+                lits[var] = Bool3._1 if val else Bool3._0
+            ans.append(Cube(lits))
+        return ans
@@ -0,0 +1,108 @@
+#! /usr/bin/env python3
+
+"""LoadOp の実装ファイル
+
+:file: loadop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+import sys
+import mmap
+import struct
+from array import array
+from logictools.bdd.dumpop import MAGIC, VERSION, HEADER
+
+
+class LoadOp:
+    """DumpOp で書き出したバイナリ形式を読み込むクラス
+
+    :param BddMgr mgr: 読み込み先のマネージャ
+
+    マネージャにノードがない場合はファイルに記録された変数順を設定する．
+    そうでない場合はマネージャの変数順のまま読み込む．
+    """
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+
+    def load(self, fin, *, use_mmap=False):
+        """読み込む．
+
+        :param fin: 入力元のバイナリファイルオブジェクト
+        :param bool use_mmap: ファイルを memory map する時 True にするフラグ
+                              (名前付きオプション引数)
+        :return: 根の枝のリストと変数名のリストのタプルを返す．
+
+        use_mmap が True の場合は fin は実際のファイルでなければならない．
+        """
+        if use_mmap:
+            buf = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return self._load(memoryview(buf))
+            finally:
+                buf.close()
+        return self._load(memoryview(fin.read()))
+
+    def _load(self, data):
+        """data の内容を読み込む．
+
+        :param memoryview data: ファイルの内容
+        """
+        if len(data) < HEADER.size:
+            raise ValueError('too short')
+        magic, version, var_num, node_num, root_num, name_num \
+            = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('not a BDD file')
+        if version != VERSION:
+            raise ValueError('unsupported version: {}'.format(version))
+        pos = HEADER.size
+        var_order = self._int_array(data, pos, var_num)
+        pos += var_num * 4
+        root_array = self._int_array(data, pos, root_num)
+        pos += root_num * 4
+        node_array = self._int_array(data, pos, node_num * 3)
+        pos += node_num * 12
+
+        mgr = self._mgr
+        if mgr.node_num == 0:
+            mgr.set_var_order(list(var_order))
+        # 読み込んだノード位置から枝への対応表
+        # 定数の枝はそのまま対応させる．
+        edge_table = [0]
+        for i in range(0, node_num * 3, 3):
+            index = node_array[i]
+            e0 = node_array[i + 1]
+            e1 = node_array[i + 2]
+            e0 = edge_table[e0 >> 1] ^ (e0 & 1)
+            e1 = edge_table[e1 >> 1] ^ (e1 & 1)
+            edge_table.append(mgr.mux_step(index, e0, e1))
+        edge_list = [edge_table[edge >> 1] ^ (edge & 1)
+                     for edge in root_array]
+        # memory map したバッファを閉じられるように参照を解放する．
+        del var_order, root_array, node_array
+
+        var_names = []
+        for _ in range(name_num):
+            n, = struct.unpack_from('<I', data, pos)
+            pos += 4
+            var_names.append(bytes(data[pos:pos + n]).decode('utf-8'))
+            pos += n
+        data.release()
+        return edge_list, var_names
+
+    @staticmethod
+    def _int_array(data, pos, num):
+        """data の pos から num 個の整数の配列を取り出す．
+
+        リトルエンディアンのマシンではコピーせずに memoryview を返す．
+        """
+        if pos + num * 4 > len(data):
+            raise ValueError('too short')
+        chunk = data[pos:pos + num * 4]
+        if sys.byteorder == 'little':
+            return chunk.cast('i')
+        ans = array('i', chunk.tobytes())
+        ans.byteswap()
+        return ans
@@ -10,30 +10,42 @@
 
 class NodeCollector:
     """Bdd のノードを DFS で集めるためのクラス
+
+    ノードはノード番号で表す．
+
+    :param BddMgr mgr: 対象のマネージャ
     """
 
-    def __init__(self):
+    def __init__(self, mgr):
+        self._store = mgr.store
         self._node_list = []
+        self._node_set = set()
         self._indexed_node_list = []
 
     def get_node(self, edge):
         """edge を根とする部分グラフをDFSにたどり
         ノードを node_list に入れる．
-        """
-        if edge.is_const():
-            return
 
-        node = edge.node
-        if node in self._node_list:
-            return
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        """
+        store = self._store
+        stack = [edge >> 1]
+        while stack:
+            node = stack.pop()
+            if node == 0:
+                continue
+            if node in self._node_set:
+                continue
 
-        self._node_list.append(node)
-        index = node.index
-        while len(self._indexed_node_list) <= index:
-            self._indexed_node_list.append([])
-        self._indexed_node_list[index].append(node)
-        self.get_node(node.edge0)
-        self.get_node(node.edge1)
+            self._node_set.add(node)
+            self._node_list.append(node)
+            index = store.index(node)
+            while len(self._indexed_node_list) <= index:
+                self._indexed_node_list.append([])
+            self._indexed_node_list[index].append(node)
+            # 0枝側を先にたどるように逆順に積む．
+            stack.append(store.edge1(node) >> 1)
+            stack.append(store.edge0(node) >> 1)
 
     @property
     def node_list(self):
@@ -42,6 +54,12 @@ class NodeCollector:
         for node in self._node_list:
             yield node
 
+    @property
+    def node_num(self):
+        """集めたノード数を返す．
+        """
+        return len(self._node_list)
+
     @property
     def max_index(self):
         """インデックスの最大値を返す．
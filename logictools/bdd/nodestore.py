@@ -0,0 +1,258 @@
+#! /usr/bin/env python3
+
+"""NodeStore の実装ファイル
+
+:file: nodestore.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+from array import array
+
+
+# 終端ノードのインデックス
+# 全ての変数のインデックスよりも大きな値にしておく．
+TERMINAL_INDEX = 0x7FFFFFFF
+
+# 解放済みのノードのインデックス
+FREE_INDEX = -1
+
+
+class NodeStore:
+    """決定グラフのノードを配列で保持するクラス
+
+    ノードは番号(node id)で識別され，インデックス，0枝，1枝を
+    それぞれ別の配列(カラム)に格納する．
+    0番のノードは終端ノードを表す．
+
+    枝は整数で表し，node_id * 2 + 極性 という符号化を行う．
+    そのため，0 が定数0，1 が定数1を表す．
+
+    ノードテーブルはインデックスごとのサブテーブルに分かれており，
+    各サブテーブルは2つの枝から作られた整数をキーとし，
+    ノード番号を値とする辞書で表す．
+    極性の正規化などの意味的な処理は行わないので，
+    ここで扱うグラフは BDD 以外の決定グラフでもよい．
+
+    各ノードは参照回数を持つ．
+    参照回数は外部(Bdd などのハンドル)からの参照と，参照回数が正の
+    親ノードからの参照の和である．
+    つまり，ノードは自身の参照回数が正の時のみ子供を参照している．
+    作られたばかりのノードの参照回数は 0 なので，
+    演算の途中で作られて使われなかったノードは自然に参照回数 0 になる．
+    参照回数が 0 のノードを dead ノードと呼び，
+    garbage_collection() で回収される．
+    """
+
+    def __init__(self):
+        self._index_array = array('i', [TERMINAL_INDEX])
+        self._edge0_array = array('i', [0])
+        self._edge1_array = array('i', [0])
+        self._ref_array = array('i', [0])
+        self._table_list = []
+        self._node_num = 0
+        self._free_list = []
+        self._dead_num = 0
+
+    def new_node(self, index, edge0, edge1):
+        """ノードを探す．なければ作る．
+
+        :param int index: インデックス
+        :param int edge0: 0枝
+        :param int edge1: 1枝
+        :return: ノードを指す正極性の枝を返す．
+        """
+        if index >= len(self._table_list):
+            self._extend_table(index)
+        table = self._table_list[index]
+        key = (edge0 << 32) | edge1
+        node_id = table.get(key)
+        if node_id is None:
+            if self._free_list:
+                node_id = self._free_list.pop()
+                self._index_array[node_id] = index
+                self._edge0_array[node_id] = edge0
+                self._edge1_array[node_id] = edge1
+                self._ref_array[node_id] = 0
+            else:
+                node_id = len(self._index_array)
+                self._index_array.append(index)
+                self._edge0_array.append(edge0)
+                self._edge1_array.append(edge1)
+                self._ref_array.append(0)
+            table[key] = node_id
+            self._node_num += 1
+            self._dead_num += 1
+        return node_id * 2
+
+    def relink(self, node_id, index, edge0, edge1):
+        """既存のノードの内容を書き換える．
+
+        :param int node_id: ノード番号
+        :param int index: 新しいインデックス
+        :param int edge0: 新しい0枝
+        :param int edge1: 新しい1枝
+
+        参照回数は変更しないので呼び出し側で調整する必要がある．
+        同じ内容のノードが既に存在していてはいけない．
+        """
+        old_key = (self._edge0_array[node_id] << 32) | self._edge1_array[node_id]
+        del self._table_list[self._index_array[node_id]][old_key]
+        if index >= len(self._table_list):
+            self._extend_table(index)
+        key = (edge0 << 32) | edge1
+        assert key not in self._table_list[index]
+        self._table_list[index][key] = node_id
+        self._index_array[node_id] = index
+        self._edge0_array[node_id] = edge0
+        self._edge1_array[node_id] = edge1
+
+    def free_node(self, node_id):
+        """dead ノードを解放する．
+
+        :param int node_id: ノード番号
+        """
+        assert self._ref_array[node_id] == 0
+        index = self._index_array[node_id]
+        key = (self._edge0_array[node_id] << 32) | self._edge1_array[node_id]
+        del self._table_list[index][key]
+        self._index_array[node_id] = FREE_INDEX
+        self._free_list.append(node_id)
+        self._node_num -= 1
+        self._dead_num -= 1
+
+    def inc_ref(self, edge):
+        """枝の指すノードの参照回数を増やす．
+
+        :param int edge: 枝
+
+        参照回数が 0 から 1 になった場合には子供の参照回数も増やす．
+        """
+        ref = self._ref_array
+        stack = [edge >> 1]
+        while stack:
+            node_id = stack.pop()
+            if node_id == 0:
+                continue
+            ref[node_id] += 1
+            if ref[node_id] == 1:
+                self._dead_num -= 1
+                stack.append(self._edge0_array[node_id] >> 1)
+                stack.append(self._edge1_array[node_id] >> 1)
+
+    def dec_ref(self, edge):
+        """枝の指すノードの参照回数を減らす．
+
+        :param int edge: 枝
+
+        参照回数が 0 になった場合には子供の参照回数も減らす．
+        ノード自体は garbage_collection() まで残しておく．
+        """
+        ref = self._ref_array
+        stack = [edge >> 1]
+        while stack:
+            node_id = stack.pop()
+            if node_id == 0:
+                continue
+            ref[node_id] -= 1
+            if ref[node_id] == 0:
+                self._dead_num += 1
+                stack.append(self._edge0_array[node_id] >> 1)
+                stack.append(self._edge1_array[node_id] >> 1)
+
+    def garbage_collection(self):
+        """dead ノードを回収する．
+
+        :return: 回収したノード数を返す．
+        """
+        if self._dead_num == 0:
+            return 0
+        ref_array = self._ref_array
+        n = 0
+        for table in self._table_list:
+            dead_list = [(key, node_id) for key, node_id in table.items()
+                         if ref_array[node_id] == 0]
+            for key, node_id in dead_list:
+                del table[key]
+                self._index_array[node_id] = FREE_INDEX
+                self._free_list.append(node_id)
+            n += len(dead_list)
+        self._node_num -= n
+        self._dead_num = 0
+        return n
+
+    @property
+    def node_num(self):
+        """終端ノードを除いたノード数を返す．
+
+        dead ノードも含む．
+        """
+        return self._node_num
+
+    def index_node_num(self, index):
+        """インデックスが index のノード数を返す．
+
+        dead ノードも含む．
+        """
+        if index >= len(self._table_list):
+            return 0
+        return len(self._table_list[index])
+
+    def index_node_list(self, index):
+        """インデックスが index のノード番号のリストを返す．
+
+        dead ノードも含む．
+        """
+        if index >= len(self._table_list):
+            return []
+        return list(self._table_list[index].values())
+
+    @property
+    def dead_num(self):
+        """dead ノード数を返す．
+        """
+        return self._dead_num
+
+    def ref(self, node_id):
+        """ノードの参照回数を返す．
+        """
+        return self._ref_array[node_id]
+
+    def index(self, node_id):
+        """ノードのインデックスを返す．
+        """
+        return self._index_array[node_id]
+
+    def edge0(self, node_id):
+        """ノードの0枝を返す．
+        """
+        return self._edge0_array[node_id]
+
+    def edge1(self, node_id):
+        """ノードの1枝を返す．
+        """
+        return self._edge1_array[node_id]
+
+    def _extend_table(self, index):
+        """サブテーブルを index まで拡張する．
+        """
+        while len(self._table_list) <= index:
+            self._table_list.append({})
+
+    @property
+    def index_array(self):
+        """インデックスの配列を返す．
+        """
+        return self._index_array
+
+    @property
+    def edge0_array(self):
+        """0枝の配列を返す．
+        """
+        return self._edge0_array
+
+    @property
+    def edge1_array(self):
+        """1枝の配列を返す．
+        """
+        return self._edge1_array
@@ -0,0 +1,130 @@
+#! /usr/bin/env python3
+
+"""SatOp の実装ファイル
+
+:file: satop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+from logictools.bool3 import Bool3
+from logictools.cube import Cube
+
+
+class SatOp:
+    """充足割当の数え上げと列挙を行うクラス
+
+    :param BddMgr mgr: 対象のマネージャ
+    """
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+        self._store = mgr.store
+
+    def count(self, edge, nvars):
+        """充足する割当の数を数える．
+
+        :param int edge: 根の枝
+        :param int nvars: 変数の数
+        :return: 0 から nvars - 1 の変数に関する充足割当の数を返す．
+
+        各ノードの値を一度だけ計算するのでノード数に比例した時間で終わる．
+        値はノードのレベル以下の変数に関する充足割当の数で，
+        正極性のノードについてのみ記録する．
+        負極性の枝の値は全割当の数から引いて求める．
+        """
+        mgr = self._mgr
+        store = self._store
+        var_num = mgr.var_num
+        table = {}
+
+        def value(edge):
+            if edge == 0:
+                return 0
+            if edge == 1:
+                return 1
+            c = table[edge >> 1]
+            if edge & 1:
+                c = (1 << (var_num - mgr.edge_level(edge))) - c
+            return c
+
+        if edge > 1:
+            stack = [edge >> 1]
+            while stack:
+                node = stack[-1]
+                if node in table:
+                    stack.pop()
+                    continue
+                edge0 = store.edge0(node)
+                edge1 = store.edge1(node)
+                node0 = edge0 >> 1
+                node1 = edge1 >> 1
+                pending = False
+                if node1 != 0 and node1 not in table:
+                    stack.append(node1)
+                    pending = True
+                if node0 != 0 and node0 not in table:
+                    stack.append(node0)
+                    pending = True
+                if pending:
+                    # 子供の計算が終わってから処理する．
+                    continue
+                stack.pop()
+                level = mgr.edge_level(node * 2)
+                c0 = value(edge0) << (mgr.edge_level(edge0) - level - 1)
+                c1 = value(edge1) << (mgr.edge_level(edge1) - level - 1)
+                table[node] = c0 + c1
+
+        total = value(edge) << mgr.edge_level(edge)
+        # var_num 個の変数についての値を nvars 個に合わせる．
+        if nvars >= var_num:
+            return total << (nvars - var_num)
+        shift = var_num - nvars
+        assert total & ((1 << shift) - 1) == 0
+        return total >> shift
+
+    def iter_sat(self, edge, nvars):
+        """1 の終端に至る経路をキューブとして列挙する．
+
+        :param int edge: 根の枝
+        :param int nvars: キューブの入力数
+        :return: Cube を生成するジェネレータを返す．
+
+        0枝側の経路が先に列挙される．
+        キューブどうしは互いに素である．
+        """
+        store = self._store
+        # 各要素は (枝, キューブのリテラルのリスト)
+        stack = [(edge, [Bool3._d] * nvars)]
+        while stack:
+            edge, lits = stack.pop()
+            if edge == 0:
+                continue
+            if edge == 1:
+                yield Cube(lits)
+                continue
+            node = edge >> 1
+            inv = edge & 1
+            index = store.index(node)
+            lits1 = list(lits)
+            lits1[index] = Bool3._1
+            lits[index] = Bool3._0
+            # 0枝側を先にたどるように逆順に積む．
+            stack.append((store.edge1(node) ^ inv, lits1))
+            stack.append((store.edge0(node) ^ inv, lits))
+
+    def iter_minterm(self, edge, nvars):
+        """充足する割当を列挙する．
+
+        :param int edge: 根の枝
+        :param int nvars: 変数の数
+        :return: 0 と 1 のリストを生成するジェネレータを返す．
+        """
+        for cube in self.iter_sat(edge, nvars):
+            dc_list = [var for var in range(nvars) if cube[var] == Bool3._d]
+            base = [1 if cube[var] == Bool3._1 else 0 for var in range(nvars)]
+            for p in range(1 << len(dc_list)):
+                assign = list(base)
+                for i, var in enumerate(dc_list):
+                    assign[var] = (p >> i) & 1
+                yield assign
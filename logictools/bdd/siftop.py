@@ -0,0 +1,156 @@
+#! /usr/bin/env python3
+
+"""SiftOp の実装ファイル
+
+:file: siftop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+
+class SiftOp:
+    """変数順の入れ替えとシフティング(Rudell の方法)を行うクラス
+
+    :param BddMgr mgr: 対象のマネージャ
+
+    隣接するレベルの入れ替えはノードをその場で書き換えるので，
+    ノード番号の表す関数は変わらない．
+    そのため，外部の Bdd はそのまま使うことができる．
+    dead ノードが残っていると正しく動かないので，
+    あらかじめガーベージコレクションを行っておく必要がある．
+    """
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+        self._store = mgr.store
+
+    def swap(self, level):
+        """level と level + 1 の変数を入れ替える．
+
+        :param int level: レベル
+        """
+        mgr = self._mgr
+        store = self._store
+        index_array = store.index_array
+        edge0_array = store.edge0_array
+        edge1_array = store.edge1_array
+        x = mgr.level_to_var(level)
+        y = mgr.level_to_var(level + 1)
+
+        # y のノードを子供に持つ x のノードのみ書き換える．
+        # それ以外の x のノードは変数順が変わるだけで内容は変わらない．
+        node_list = []
+        for node_id in store.index_node_list(x):
+            f0 = edge0_array[node_id]
+            f1 = edge1_array[node_id]
+            if index_array[f0 >> 1] == y or index_array[f1 >> 1] == y:
+                node_list.append(node_id)
+        y_list = store.index_node_list(y)
+
+        for node_id in node_list:
+            f0 = edge0_array[node_id]
+            f1 = edge1_array[node_id]
+            f00, f01 = self._cofactor(f0, y)
+            f10, f11 = self._cofactor(f1, y)
+            # f0 は正極性なので g0 も正極性になる．
+            g0 = self._new_node(x, f00, f10)
+            g1 = self._new_node(x, f01, f11)
+            store.inc_ref(g0)
+            store.inc_ref(g1)
+            store.relink(node_id, y, g0, g1)
+            store.dec_ref(f0)
+            store.dec_ref(f1)
+
+        # 参照されなくなった y のノードを解放する．
+        for node_id in y_list:
+            if store.ref(node_id) == 0:
+                store.free_node(node_id)
+
+        mgr._swap_var_level(level)
+
+    def sift(self, *, max_growth=1.2):
+        """シフティングを行う．
+
+        :param float max_growth: 移動を打ち切るノード数の増加率
+                                 (名前付きオプション引数)
+
+        ノード数の多い変数から順に，全てのレベルに移動させてみて
+        ノード数が最小となる位置に固定する．
+        """
+        mgr = self._mgr
+        store = self._store
+        var_list = [var for var in range(mgr.var_num)
+                    if store.index_node_num(var) > 0]
+        var_list.sort(key=lambda var: store.index_node_num(var), reverse=True)
+        for var in var_list:
+            self._sift_var(var, max_growth)
+
+    def _sift_var(self, var, max_growth):
+        """一つの変数のシフティングを行う．
+        """
+        mgr = self._mgr
+        store = self._store
+        max_level = mgr.var_num - 1
+        level = mgr.var_to_level(var)
+        best_size = store.node_num
+        best_level = level
+        limit = best_size * max_growth
+
+        # 近い方の端から先に動かす．
+        if level > max_level - level:
+            dir_list = [1, -1]
+        else:
+            dir_list = [-1, 1]
+        for d in dir_list:
+            if d == 1:
+                while level < max_level:
+                    self.swap(level)
+                    level += 1
+                    size = store.node_num
+                    if size < best_size:
+                        best_size = size
+                        best_level = level
+                        limit = best_size * max_growth
+                    elif size > limit:
+                        break
+            else:
+                while level > 0:
+                    self.swap(level - 1)
+                    level -= 1
+                    size = store.node_num
+                    if size < best_size:
+                        best_size = size
+                        best_level = level
+                        limit = best_size * max_growth
+                    elif size > limit:
+                        break
+
+        # 最良の位置に戻す．
+        while level < best_level:
+            self.swap(level)
+            level += 1
+        while level > best_level:
+            self.swap(level - 1)
+            level -= 1
+
+    def _cofactor(self, edge, index):
+        """edge のインデックス index に関するコファクターを返す．
+
+        edge の根のインデックスが index でない場合は
+        edge は index に依存していない．
+        """
+        store = self._store
+        node_id = edge >> 1
+        if store.index_array[node_id] != index:
+            return edge, edge
+        inv = edge & 1
+        return (store.edge0_array[node_id] ^ inv,
+                store.edge1_array[node_id] ^ inv)
+
+    def _new_node(self, index, edge0, edge1):
+        """入れ替え用にノードを作る．
+        """
+        if edge0 == edge1:
+            return edge0
+        oinv = edge0 & 1
+        return self._store.new_node(index, edge0 ^ oinv, edge1 ^ oinv) | oinv
@@ -7,29 +7,47 @@
 :copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
 """
 
-from logictools.bdd.bddedge import BddEdge
-
 
 class TruthOp:
+    """真理値表形式の文字列から BDD を作るクラス
+
+    文字列の先頭が全ての変数が 1 の時の値を表す．
+    """
 
     def __init__(self, mgr):
         self._mgr = mgr
-        self._table = {}
+        self._table = {"0": 0, "1": 1}
 
     def op_step(self, truth_str, index):
-        if truth_str == "0":
-            return BddEdge.zero()
-        if truth_str == "1":
-            return BddEdge.one()
-        if truth_str in self._table:
-            return self._table[truth_str]
-
-        n = len(truth_str)
-        nh = n // 2
-        truth_str1 = truth_str[:nh]
-        truth_str0 = truth_str[nh:]
-        e0 = self.op_step(truth_str0, index + 1)
-        e1 = self.op_step(truth_str1, index + 1)
-        r = self._mgr.new_node(index, e0, e1)
-        self._table[truth_str] = r
-        return r
+        """truth_str を表す BDD を作る．
+
+        :param str truth_str: 真理値表形式の文字列
+        :param int index: truth_str の最上位の変数番号
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        """
+        table = self._table
+        root_str = truth_str
+        stack = [(truth_str, index)]
+        while stack:
+            truth_str, index = stack[-1]
+            if truth_str in table:
+                stack.pop()
+                continue
+            nh = len(truth_str) // 2
+            truth_str1 = truth_str[:nh]
+            truth_str0 = truth_str[nh:]
+            pending = False
+            if truth_str1 not in table:
+                stack.append((truth_str1, index + 1))
+                pending = True
+            if truth_str0 not in table:
+                stack.append((truth_str0, index + 1))
+                pending = True
+            if pending:
+                continue
+            stack.pop()
+            e0 = table[truth_str0]
+            e1 = table[truth_str1]
+            table[truth_str] = self._mgr.mux_step(index, e0, e1)
+        return table[root_str]
@@ -0,0 +1,273 @@
+#! /usr/bin/env python3
+
+"""BDD の初期変数順を求めるヒューリスティック
+
+:file: varorder.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+
+いずれの関数も変数番号をレベルの順に並べたリストを返す．
+結果は BddMgr.set_var_order() に渡すことを想定している．
+"""
+
+from logictools.bool3 import Bool3
+from logictools.parser import Parser
+
+
+class _ExprNode:
+    """論理式の構造を表すクラス
+
+    Parser が作るオブジェクトの代わりに用いる．
+
+    :param str op: 演算の種類('var', 'const', '~', '&', '|', '^')
+    :param list[_ExprNode] child_list: 子供のリスト
+    :param int var: 変数番号(op が 'var' の時のみ意味を持つ)
+    """
+
+    def __init__(self, op, child_list=(), var=None):
+        self.op = op
+        self.child_list = list(child_list)
+        self.var = var
+        if op == 'var':
+            self.support = frozenset([var])
+            self.depth = 0
+        else:
+            self.support = frozenset().union(
+                *[child.support for child in child_list])
+            self.depth = max([child.depth + 1 for child in child_list],
+                             default=0)
+
+    def __invert__(self):
+        return _ExprNode('~', [self])
+
+    def __and__(self, other):
+        return _ExprNode('&', [self, other])
+
+    def __or__(self, other):
+        return _ExprNode('|', [self, other])
+
+    def __xor__(self, other):
+        return _ExprNode('^', [self, other])
+
+
+class _ExprParser(Parser):
+    """論理式の構造を取り出すためのパーザ
+    """
+
+    def _make_const0(self):
+        return _ExprNode('const')
+
+    def _make_const1(self):
+        return _ExprNode('const')
+
+    def _make_literal(self, var_id):
+        return _ExprNode('var', var=var_id)
+
+
+def _parse(expr_str, var_map):
+    """論理式を表す文字列をパーズして構造を返す．
+    """
+    parser = _ExprParser(len(var_map), var_map)
+    expr = parser(expr_str)
+    if expr is None:
+        raise ValueError('syntax error: {}'.format(expr_str))
+    return expr
+
+
+def _all_vars(var_map):
+    """var_map 中の全ての変数番号のリストを返す．
+    """
+    n = max(var_map.values(), default=-1) + 1
+    return list(range(n))
+
+
+def _complete(order, var_list):
+    """order に現れない変数を末尾に追加する．
+    """
+    used = set(order)
+    return order + [var for var in var_list if var not in used]
+
+
+def dfs_order(expr_str, var_map):
+    """論理式の DFS(fanin 順)で変数順を求める．
+
+    :param str expr_str: 論理式を表す文字列
+    :param dict[str, int] var_map: 変数名から変数番号への辞書
+    :return: 変数番号のリストを返す．
+
+    式の木を根から深さ優先でたどり，最初に現れた順に変数を並べる．
+    各ノードでは深い方の子供から先にたどる．
+    """
+    expr = _parse(expr_str, var_map)
+    order = []
+    visited = set()
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if node.op == 'var':
+            if node.var not in visited:
+                visited.add(node.var)
+                order.append(node.var)
+            continue
+        # 深い子供から先に取り出されるように逆順に積む．
+        child_list = sorted(node.child_list,
+                            key=lambda child: child.depth, reverse=True)
+        stack.extend(reversed(child_list))
+    return _complete(order, _all_vars(var_map))
+
+
+def expr_hyperedges(expr_str, var_map):
+    """論理式から変数のハイパーエッジのリストを作る．
+
+    :param str expr_str: 論理式を表す文字列
+    :param dict[str, int] var_map: 変数名から変数番号への辞書
+    :return: 変数番号の frozenset のリストを返す．
+
+    2つ以上の変数に依存する部分式ごとに，そのサポートをハイパーエッジとする．
+    """
+    expr = _parse(expr_str, var_map)
+    edge_list = []
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if node.op in ('&', '|', '^') and len(node.support) > 1:
+            edge_list.append(node.support)
+        stack.extend(node.child_list)
+    return edge_list
+
+
+def force_order(hyperedge_list, var_list, *, max_iter=20):
+    """FORCE ヒューリスティックで変数順を求める．
+
+    :param hyperedge_list: 変数番号の集合のリスト
+    :param list[int] var_list: 初期の変数順
+    :param int max_iter: 最大繰り返し回数(名前付きオプション引数)
+    :return: 変数番号のリストを返す．
+
+    各ハイパーエッジの重心を求め，各変数をそれを含むハイパーエッジの
+    重心の平均の位置に移動させることを繰り返す．
+    ハイパーエッジの幅(最大位置と最小位置の差)の総和が減らなくなったら
+    終了する．
+    """
+    edge_list = [list(edge) for edge in hyperedge_list if len(edge) > 1]
+    order = list(var_list)
+    pos = {var: i for i, var in enumerate(order)}
+
+    def span(pos):
+        ans = 0
+        for edge in edge_list:
+            p_list = [pos[var] for var in edge]
+            ans += max(p_list) - min(p_list)
+        return ans
+
+    best_order = order
+    best_cost = span(pos)
+    for _ in range(max_iter):
+        # 各変数の新しい位置を求める．
+        sum_dict = {}
+        num_dict = {}
+        for edge in edge_list:
+            cog = sum(pos[var] for var in edge) / len(edge)
+            for var in edge:
+                sum_dict[var] = sum_dict.get(var, 0.0) + cog
+                num_dict[var] = num_dict.get(var, 0) + 1
+        new_pos = {var: sum_dict[var] / num_dict[var] if var in num_dict
+                   else pos[var] for var in order}
+        order = sorted(order, key=lambda var: (new_pos[var], pos[var]))
+        pos = {var: i for i, var in enumerate(order)}
+        cost = span(pos)
+        if cost >= best_cost:
+            break
+        best_order = order
+        best_cost = cost
+    return best_order
+
+
+def expr_order(expr_str, var_map, *, method='dfs'):
+    """論理式から変数順を求める．
+
+    :param str expr_str: 論理式を表す文字列
+    :param dict[str, int] var_map: 変数名から変数番号への辞書
+    :param str method: 'dfs' か 'force'(名前付きオプション引数)
+    :return: 変数番号のリストを返す．
+
+    'force' の場合は DFS 順を初期値として FORCE を適用する．
+    """
+    order = dfs_order(expr_str, var_map)
+    if method == 'dfs':
+        return order
+    if method == 'force':
+        return force_order(expr_hyperedges(expr_str, var_map), order)
+    raise ValueError('unknown method: {}'.format(method))
+
+
+def cover_order(cover, *, method='dfs'):
+    """カバーから変数順を求める．
+
+    :param Cover cover: カバー
+    :param str method: 'dfs' か 'force'(名前付きオプション引数)
+    :return: 変数番号のリストを返す．
+
+    'dfs' ではリテラル数の多いキューブから順に，
+    最初に現れた順に変数を並べる．
+    'force' ではキューブのサポートをハイパーエッジとして FORCE を適用する．
+    """
+    if cover.cube_num == 0:
+        return []
+    input_num = cover[0].input_num
+    edge_list = []
+    for cube in cover.cube_list:
+        edge_list.append([var for var in range(input_num)
+                          if cube[var] != Bool3._d])
+    order = []
+    visited = set()
+    for edge in sorted(edge_list, key=len, reverse=True):
+        for var in edge:
+            if var not in visited:
+                visited.add(var)
+                order.append(var)
+    order = _complete(order, list(range(input_num)))
+    if method == 'dfs':
+        return order
+    if method == 'force':
+        return force_order(edge_list, order)
+    raise ValueError('unknown method: {}'.format(method))
+
+
+def interleave_order(present_list, next_list, *, input_list=()):
+    """現状態変数と次状態変数を交互に並べた変数順を作る．
+
+    :param list[int] present_list: 現状態変数のリスト
+    :param list[int] next_list: 次状態変数のリスト
+    :param list[int] input_list: 入力変数のリスト(名前付きオプション引数)
+    :return: 変数番号のリストを返す．
+
+    入力変数を先頭に置き，その後に現状態変数と対応する次状態変数を
+    交互に並べる．
+    """
+    assert len(present_list) == len(next_list)
+    order = list(input_list)
+    for s, t in zip(present_list, next_list):
+        order.append(s)
+        order.append(t)
+    return order
+
+
+def fsm_order(*, input_map, state_map):
+    """符号化された有限状態機械の変数順を求める．
+
+    :param input_map: 入力の符号割当
+    :param state_map: 状態の符号割当
+    :return: 変数番号のリストを返す．
+
+    変数番号は Fsm.extract_functions() と同様に，
+    状態ビットが 0 から ns - 1，入力ビットが ns から ns + ni - 1 とし，
+    次状態ビットは ns + ni から ns + ni + ns - 1 とする．
+    (ns は状態のビット長，ni は入力のビット長)
+    """
+    ni = len(next(iter(input_map.values())))
+    ns = len(next(iter(state_map.values())))
+    present_list = list(range(ns))
+    input_list = list(range(ns, ns + ni))
+    next_list = list(range(ns + ni, ns + ni + ns))
+    return interleave_order(present_list, next_list, input_list=input_list)
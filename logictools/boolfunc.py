@@ -430,7 +430,15 @@ class BoolFunc:
         """主項のリストを作る．
 
         :return: 主項の Cube のリストを返す．
+
+        入力数が qm.IMPLICIT_THRESHOLD を超えた場合は
+        最小項を列挙せずに真理値表から直接求める．
         """
+        if self.input_num > qm.IMPLICIT_THRESHOLD:
+            # 真理値表形式の文字列の先頭が全ての変数が 1 の時の値を表す．
+            truth_str = ''.join('0' if val == Bool3._0 else '1'
+                                for val in reversed(self.__tv_list))
+            return qm.gen_primes_implicit(truth_str)
         on, dc, off = self.gen_minterm_list()
         return qm.gen_primes(on + dc)
 
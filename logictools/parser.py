@@ -202,15 +202,15 @@ class Parser:
     def __parse_primary(self):
         token = self.__read_token()
         if token.id == '0':
-            return BoolFunc.make_const0(self.__input_num)
+            return self._make_const0()
         if token.id == '1':
-            return BoolFunc.make_const1(self.__input_num)
+            return self._make_const1()
         if token.id == 'Var':
-            return BoolFunc.make_literal(self.__input_num, token.var_id)
+            return self._make_literal(token.var_id)
         if token.id == '~':
             token = self.__read_token()
             if token.id == 'Var':
-                func1 = BoolFunc.make_literal(self.__input_num, token.var_id)
+                func1 = self._make_literal(token.var_id)
             if token.id == '(':
                 func1 = self.__parse_expr(')')
             return ~func1
@@ -222,6 +222,26 @@ class Parser:
         self.__emsg_list.append(emsg)
         return None
 
+    def _make_const0(self):
+        """恒偽関数を作る．
+
+        派生クラスで上書きすることで BoolFunc 以外のオブジェクトを作ることができる．
+        作られるオブジェクトは ~, &, |, ^ 演算をサポートしている必要がある．
+        """
+        return BoolFunc.make_const0(self.__input_num)
+
+    def _make_const1(self):
+        """恒真関数を作る．
+        """
+        return BoolFunc.make_const1(self.__input_num)
+
+    def _make_literal(self, var_id):
+        """リテラル関数を作る．
+
+        :param int var_id: 変数番号
+        """
+        return BoolFunc.make_literal(self.__input_num, var_id)
+
     def __read_token(self):
         if self.__rpos < len(self.__token_list):
             token = self.__token_list[self.__rpos]
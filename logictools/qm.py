@@ -7,8 +7,15 @@
 :copyright: Copyright (C) 2017 Yusuke Matsunaga, All rights reserved.
 """
 
+from logictools.bool3 import Bool3
 from logictools.cover import Cover
 from logictools.mincov import MinCov
+from logictools.bdd.bddmgr import BddMgr
+from logictools.zdd.zddmgr import ZddMgr
+
+
+# 入力数がこの値を超えた場合は BDD/ZDD を用いて主項を求める．
+IMPLICIT_THRESHOLD = 6
 
 
 def gen_primes(minterm_list):
@@ -16,7 +23,23 @@ def gen_primes(minterm_list):
 
     :param minterm_list: 最小項のリスト
     :return: プライムインプリカントのリスト
+
+    入力数が IMPLICIT_THRESHOLD を超えた場合は gen_primes_implicit() を用いる．
     """
+    if minterm_list and minterm_list[0].input_num > IMPLICIT_THRESHOLD:
+        input_num = minterm_list[0].input_num
+        nexp = 1 << input_num
+        tv_list = ['0' for _ in range(nexp)]
+        for minterm in minterm_list:
+            # 変数 0 が最上位のビットに対応する．
+            # 真理値表形式の文字列の先頭が全ての変数が 1 の時の値を表す．
+            p = 0
+            for i in range(input_num):
+                if minterm[i] == Bool3._1:
+                    p |= 1 << (input_num - i - 1)
+            tv_list[nexp - 1 - p] = '1'
+        return gen_primes_implicit(''.join(tv_list))
+
     all_cubes = set()
     used_cubes = set()
     src_list = minterm_list
@@ -46,6 +69,27 @@ def gen_primes(minterm_list):
     return primes
 
 
+def gen_primes_implicit(truth_str):
+    """最小項を列挙せずに全てのプライムインプリカントを求める．
+
+    :param str truth_str: 真理値表形式の文字列(BddMgr.from_truth() と同じ形式)
+    :return: プライムインプリカントのリスト
+
+    BDD で表した関数から ZDD で主項の集合を求める(Coudert と Madre の方法)．
+    """
+    n = len(truth_str)
+    input_num = 0
+    while (1 << input_num) < n:
+        input_num += 1
+    bdd_mgr = BddMgr()
+    zdd_mgr = ZddMgr()
+    f = bdd_mgr.from_truth(truth_str)
+    primes = list(zdd_mgr.primes(f).iter_cubes(input_num))
+    primes.sort()
+
+    return primes
+
+
 def gen_minimum_cover(onset, prime_list):
     """最簡積和形論理式を求める．
 
@@ -0,0 +1,82 @@
+#! /usr/bin/env python3
+
+"""PrimeOp の実装ファイル
+
+:file: primeop.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+
+class PrimeOp:
+    """BDD で表された関数の主項の集合を ZDD で求めるクラス
+
+    :param ZddMgr mgr: 結果を格納するマネージャ
+    :param BddMgr bdd_mgr: 関数を表す BDD のマネージャ
+
+    Coudert と Madre の方法で最小項を列挙せずに求める．
+    f の最上位の変数を x とすると f の主項の集合 P(f) は
+      P(f) = P(f0・f1) ∪ ~x・(P(f0) - P(f0・f1)) ∪ x・(P(f1) - P(f0・f1))
+    で表される．
+    """
+
+    def __init__(self, mgr, bdd_mgr):
+        self._mgr = mgr
+        self._bdd_mgr = bdd_mgr
+        # BDD の枝から主項の集合を表す ZDD の枝への辞書
+        self._table = {0: 0, 1: 1}
+
+    def op_step(self, edge):
+        """edge の表す関数の主項の集合を求める．
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        """
+        mgr = self._mgr
+        bdd_mgr = self._bdd_mgr
+        store = bdd_mgr.store
+        table = self._table
+        # f0・f1 は一度だけ計算するように記録しておく．
+        prod_table = {}
+        stack = [edge]
+        while stack:
+            f = stack[-1]
+            if f in table:
+                stack.pop()
+                continue
+            node = f >> 1
+            inv = f & 1
+            f0 = store.edge0(node) ^ inv
+            f1 = store.edge1(node) ^ inv
+            f01 = prod_table.get(f)
+            if f01 is None:
+                f01 = bdd_mgr.and_step(f0, f1)
+                prod_table[f] = f01
+            pending = False
+            for g in (f01, f1, f0):
+                if g not in table:
+                    stack.append(g)
+                    pending = True
+            if pending:
+                # 子供の計算が終わってから処理する．
+                continue
+            stack.pop()
+            var = store.index(node)
+            p01 = table[f01]
+            p0 = mgr.difference_step(table[f0], p01)
+            p1 = mgr.difference_step(table[f1], p01)
+            result = mgr.union_step(self._attach(var * 2 + 1, p0),
+                                    self._attach(var * 2, p1))
+            table[f] = mgr.union_step(p01, result)
+        return table[edge]
+
+    def _attach(self, zvar, edge):
+        """edge の全てのキューブにリテラル zvar を加える．
+
+        BDD の変数順が変数番号の順と異なる場合には積演算を用いる．
+        """
+        mgr = self._mgr
+        if edge == 0:
+            return 0
+        if zvar < mgr.store.index(edge >> 1):
+            return mgr.new_node(zvar, 0, edge)
+        return mgr.product_step(mgr.new_node(zvar, 0, 1), edge)
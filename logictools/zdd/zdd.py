@@ -0,0 +1,145 @@
+#! /usr/bin/env python3
+
+"""Zdd の実装ファイル
+
+:file: zdd.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+from logictools.cover import Cover
+
+
+class Zdd:
+    """キューブの集合を表す ZDD のクラス
+
+    実体は ZddMgr 中のノードを指す枝(整数)とマネージャの組で，
+    ノードの情報は全て ZddMgr が持つ．
+    Zdd が存在する間は根のノードの参照回数が増やされている．
+    """
+
+    def __init__(self, mgr, root):
+        self._mgr = mgr
+        self._root = root
+        mgr.store.inc_ref(root)
+
+    def __del__(self):
+        self._mgr.store.dec_ref(self._root)
+
+    def _set_root(self, root):
+        """根の枝を付け替える．
+        """
+        self._mgr.store.inc_ref(root)
+        self._mgr.store.dec_ref(self._root)
+        self._root = root
+
+    def __or__(self, other):
+        """和集合を返す．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        return self._mgr.union_op(self, other)
+
+    def __ior__(self, other):
+        """和集合を計算して代入する．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        rzdd = self._mgr.union_op(self, other)
+        self._set_root(rzdd._root)
+        return self
+
+    def __and__(self, other):
+        """共通部分を返す．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        return self._mgr.intersection_op(self, other)
+
+    def __iand__(self, other):
+        """共通部分を計算して代入する．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        rzdd = self._mgr.intersection_op(self, other)
+        self._set_root(rzdd._root)
+        return self
+
+    def __sub__(self, other):
+        """差集合を返す．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        return self._mgr.difference_op(self, other)
+
+    def __isub__(self, other):
+        """差集合を計算して代入する．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        rzdd = self._mgr.difference_op(self, other)
+        self._set_root(rzdd._root)
+        return self
+
+    def __mul__(self, other):
+        """キューブ集合の積を返す．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        return self._mgr.product_op(self, other)
+
+    def __imul__(self, other):
+        """キューブ集合の積を計算して代入する．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        rzdd = self._mgr.product_op(self, other)
+        self._set_root(rzdd._root)
+        return self
+
+    def __eq__(self, other):
+        """等価比較を行う．
+        """
+        if not isinstance(other, Zdd):
+            raise NotImplementedError
+        return self._mgr == other._mgr and self._root == other._root
+
+    def is_zero(self):
+        """空集合の時 True を返す．
+        """
+        return self._root == 0
+
+    def is_one(self):
+        """空のキューブ(恒真)のみからなる集合の時 True を返す．
+        """
+        return self._root == 1
+
+    @property
+    def cube_num(self):
+        """キューブ数を返す．
+        """
+        return self._mgr.count_step(self._root)
+
+    def size(self):
+        """ノード数を返す．
+
+        終端ノードは含まない．
+        """
+        return self._mgr.size_step([self._root])
+
+    def iter_cubes(self, input_num):
+        """キューブを列挙する．
+
+        :param int input_num: キューブの入力数
+        :return: Cube を生成するジェネレータを返す．
+
+        必要になった時点で一つずつ生成する．
+        """
+        yield from self._mgr.iter_cubes_step(self._root, input_num)
+
+    def to_cover(self, input_num):
+        """カバーに変換する．
+
+        :param int input_num: 入力数
+        """
+        return Cover(list(self.iter_cubes(input_num)))
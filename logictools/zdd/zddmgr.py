@@ -0,0 +1,502 @@
+#! /usr/bin/env python3
+
+"""ZddMgr の実装ファイル
+
+:file: zddmgr.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+from logictools.bool3 import Bool3
+from logictools.cube import Cube
+from logictools.bdd.nodestore import NodeStore
+from logictools.bdd.computedtable import ComputedTable
+from logictools.zdd.zdd import Zdd
+from logictools.zdd.primeop import PrimeOp
+
+
+# 演算結果テーブルのキーに用いる演算の種類
+_UNION_OP = 0
+_INTERSECTION_OP = 1
+_DIFFERENCE_OP = 2
+_JOIN_OP = 3
+_CONFLICT_OP = 4
+
+# _apply_step() のタスクの種類
+_CALC = 0   # 演算を行う．
+_PASS = 1   # 子供の結果をそのまま結果とする．
+_NODE1 = 2  # 0枝の結果と固定の1枝からノードを作る．
+_NODE2 = 3  # 0枝と1枝の結果からノードを作る．
+_JOIN = 4   # join の4つの部分結果からノードを作る．
+
+
+class ZddMgr:
+    """キューブの集合を表す ZDD(Zero-suppressed Decision Diagram)を
+    管理するクラス
+
+    :param int cache_size: 演算結果テーブルのサイズ(名前付きオプション引数)
+    :param int gc_threshold: ガーベージコレクションを起動する dead ノード数
+                             (名前付きオプション引数)
+
+    ノードの格納には BddMgr と同じ NodeStore を用いる．
+    否定枝は用いないので，枝は常に偶数(node_id * 2)となる．
+    ただし，0 は空集合，1 は空のキューブのみからなる集合を表す．
+
+    入力変数 var の肯定リテラルを ZDD の変数 var * 2，
+    否定リテラルを var * 2 + 1 で表し，
+    キューブはリテラルの集合として表す．
+    ZDD の変数の順序は変数番号の順に固定する．
+    """
+
+    DEFAULT_CACHE_SIZE = 1 << 16
+    DEFAULT_GC_THRESHOLD = 10000
+
+    def __init__(self, *,
+                 cache_size=DEFAULT_CACHE_SIZE,
+                 gc_threshold=DEFAULT_GC_THRESHOLD):
+        self._store = NodeStore()
+        self._computed_table = ComputedTable(cache_size)
+        self._gc_threshold = gc_threshold
+
+    @property
+    def store(self):
+        """ノードを格納している NodeStore を返す．
+        """
+        return self._store
+
+    @property
+    def computed_table(self):
+        """演算結果テーブルを返す．
+        """
+        return self._computed_table
+
+    @property
+    def gc_threshold(self):
+        """ガーベージコレクションを起動する dead ノード数を返す．
+        """
+        return self._gc_threshold
+
+    def set_gc_threshold(self, threshold):
+        """ガーベージコレクションを起動する dead ノード数を設定する．
+
+        :param int threshold: dead ノード数
+        """
+        self._gc_threshold = threshold
+
+    def garbage_collection(self):
+        """ガーベージコレクションを行う．
+
+        :return: 回収したノード数を返す．
+        """
+        n = self._store.garbage_collection()
+        if n > 0:
+            self._computed_table.clear()
+        return n
+
+    @property
+    def node_num(self):
+        """ノード数を返す．
+
+        終端ノードは含まないが dead ノードは含む．
+        """
+        return self._store.node_num
+
+    def zero(self):
+        """空集合を作る．
+        """
+        return Zdd(self, 0)
+
+    def one(self):
+        """空のキューブのみからなる集合を作る．
+        """
+        return Zdd(self, 1)
+
+    def literal(self, var, inv=False):
+        """一つのリテラルからなるキューブのみを含む集合を作る．
+
+        :param int var: 変数番号
+        :param bool inv: 反転フラグ
+        """
+        return Zdd(self, self.new_node(var * 2 + int(inv), 0, 1))
+
+    def from_cube(self, cube):
+        """一つのキューブのみを含む集合を作る．
+
+        :param Cube cube: キューブ
+        """
+        return Zdd(self, self.cube_step(cube))
+
+    def from_cover(self, cover):
+        """カバーのキューブの集合を作る．
+
+        :param Cover cover: カバー
+        """
+        self._safe_point()
+        edge = 0
+        for cube in cover.cube_list:
+            edge = self.union_step(edge, self.cube_step(cube))
+        return Zdd(self, edge)
+
+    def primes(self, on, dc=None):
+        """BDD で表された関数の主項の集合を作る．
+
+        :param Bdd on: オンセットを表す関数
+        :param Bdd dc: ドントケアセットを表す関数
+        :return: on + dc の主項の集合を返す．
+
+        最小項を列挙しないので入力数の多い関数でも扱うことができる．
+        """
+        bdd_mgr = on._mgr
+        if dc is not None:
+            on = on | dc
+        self._safe_point()
+        op = PrimeOp(self, bdd_mgr)
+        edge = op.op_step(on._root)
+        return Zdd(self, edge)
+
+    def union_op(self, left, right):
+        """和集合を求める．
+        """
+        self._safe_point()
+        edge = self.union_step(left._root, right._root)
+        return Zdd(self, edge)
+
+    def intersection_op(self, left, right):
+        """共通部分を求める．
+        """
+        self._safe_point()
+        edge = self.intersection_step(left._root, right._root)
+        return Zdd(self, edge)
+
+    def difference_op(self, left, right):
+        """差集合を求める．
+        """
+        self._safe_point()
+        edge = self.difference_step(left._root, right._root)
+        return Zdd(self, edge)
+
+    def product_op(self, left, right):
+        """キューブ集合の積を求める．
+
+        left と right のキューブの全ての組み合わせの積からなる集合を返す．
+        同じ変数の肯定と否定のリテラルを含むキューブは取り除く．
+        """
+        self._safe_point()
+        edge = self.product_step(left._root, right._root)
+        return Zdd(self, edge)
+
+    def union_step(self, left, right):
+        """和集合を計算する．
+        """
+        return self._apply_step(_UNION_OP, left, right)
+
+    def intersection_step(self, left, right):
+        """共通部分を計算する．
+        """
+        return self._apply_step(_INTERSECTION_OP, left, right)
+
+    def difference_step(self, left, right):
+        """差集合を計算する．
+        """
+        return self._apply_step(_DIFFERENCE_OP, left, right)
+
+    def product_step(self, left, right):
+        """キューブ集合の積を計算する．
+        """
+        return self._conflict_step(self._apply_step(_JOIN_OP, left, right))
+
+    def cube_step(self, cube):
+        """キューブを表す枝を作る．
+        """
+        edge = 1
+        for var in range(cube.input_num - 1, -1, -1):
+            lit = cube[var]
+            if lit == Bool3._1:
+                edge = self.new_node(var * 2, 0, edge)
+            elif lit == Bool3._0:
+                edge = self.new_node(var * 2 + 1, 0, edge)
+        return edge
+
+    def _apply_step(self, op, left, right):
+        """集合演算を行う．
+
+        :param int op: 演算の種類
+        :param int left, right: オペランドの枝
+
+        再帰呼び出しの代わりに明示的なスタックを用いる．
+        task_stack の要素の先頭はタスクの種類(_CALC など)で，
+        結果は val_stack に積まれる．
+        """
+        store = self._store
+        index_array = store._index_array
+        edge0_array = store._edge0_array
+        edge1_array = store._edge1_array
+        cache_get = self._computed_table.get
+        cache_put = self._computed_table.put
+        new_node = self.new_node
+        task_stack = [(_CALC, left, right)]
+        val_stack = []
+        while task_stack:
+            task = task_stack.pop()
+            kind = task[0]
+            if kind == _PASS:
+                cache_put(task[1], val_stack[-1])
+                continue
+            if kind == _NODE1:
+                _, key, top, e1 = task
+                result = new_node(top, val_stack.pop(), e1)
+                cache_put(key, result)
+                val_stack.append(result)
+                continue
+            if kind == _NODE2:
+                _, key, top = task
+                e1 = val_stack.pop()
+                e0 = val_stack.pop()
+                result = new_node(top, e0, e1)
+                cache_put(key, result)
+                val_stack.append(result)
+                continue
+            if kind == _JOIN:
+                _, key, top = task
+                e01 = val_stack.pop()
+                e10 = val_stack.pop()
+                e11 = val_stack.pop()
+                e0 = val_stack.pop()
+                e1 = self.union_step(self.union_step(e11, e10), e01)
+                result = new_node(top, e0, e1)
+                cache_put(key, result)
+                val_stack.append(result)
+                continue
+
+            _, a, b = task
+            # 終端条件
+            if op == _UNION_OP:
+                if a == 0 or a == b:
+                    val_stack.append(b)
+                    continue
+                if b == 0:
+                    val_stack.append(a)
+                    continue
+            elif op == _INTERSECTION_OP:
+                if a == 0 or b == 0:
+                    val_stack.append(0)
+                    continue
+                if a == b:
+                    val_stack.append(a)
+                    continue
+            elif op == _DIFFERENCE_OP:
+                if a == 0 or a == b:
+                    val_stack.append(0)
+                    continue
+                if b == 0:
+                    val_stack.append(a)
+                    continue
+            else:
+                if a == 0 or b == 0:
+                    val_stack.append(0)
+                    continue
+                if a == 1:
+                    val_stack.append(b)
+                    continue
+                if b == 1:
+                    val_stack.append(a)
+                    continue
+            if op != _DIFFERENCE_OP and a > b:
+                # 交換則が成り立つのでキーを正規化しておく．
+                a, b = b, a
+            key = op, a, b
+            result = cache_get(key)
+            if result is not None:
+                val_stack.append(result)
+                continue
+
+            # 最上位の変数で分解する．
+            # ZDD の変数の順序は変数番号の順なのでインデックスで比較できる．
+            aindex = index_array[a >> 1]
+            bindex = index_array[b >> 1]
+            if aindex < bindex:
+                a0 = edge0_array[a >> 1]
+                a1 = edge1_array[a >> 1]
+                if op == _UNION_OP:
+                    task_stack.append((_NODE1, key, aindex, a1))
+                    task_stack.append((_CALC, a0, b))
+                elif op == _DIFFERENCE_OP:
+                    task_stack.append((_NODE1, key, aindex, a1))
+                    task_stack.append((_CALC, a0, b))
+                elif op == _INTERSECTION_OP:
+                    task_stack.append((_PASS, key))
+                    task_stack.append((_CALC, a0, b))
+                else:
+                    task_stack.append((_NODE2, key, aindex))
+                    task_stack.append((_CALC, a1, b))
+                    task_stack.append((_CALC, a0, b))
+            elif aindex > bindex:
+                b0 = edge0_array[b >> 1]
+                b1 = edge1_array[b >> 1]
+                if op == _UNION_OP:
+                    task_stack.append((_NODE1, key, bindex, b1))
+                    task_stack.append((_CALC, a, b0))
+                elif op == _JOIN_OP:
+                    task_stack.append((_NODE2, key, bindex))
+                    task_stack.append((_CALC, a, b1))
+                    task_stack.append((_CALC, a, b0))
+                else:
+                    task_stack.append((_PASS, key))
+                    task_stack.append((_CALC, a, b0))
+            else:
+                a0 = edge0_array[a >> 1]
+                a1 = edge1_array[a >> 1]
+                b0 = edge0_array[b >> 1]
+                b1 = edge1_array[b >> 1]
+                if op == _JOIN_OP:
+                    task_stack.append((_JOIN, key, aindex))
+                    task_stack.append((_CALC, a0, b1))
+                    task_stack.append((_CALC, a1, b0))
+                    task_stack.append((_CALC, a1, b1))
+                    task_stack.append((_CALC, a0, b0))
+                else:
+                    task_stack.append((_NODE2, key, aindex))
+                    task_stack.append((_CALC, a1, b1))
+                    task_stack.append((_CALC, a0, b0))
+        return val_stack[0]
+
+    def _conflict_step(self, edge):
+        """同じ変数の肯定と否定のリテラルを含むキューブを取り除く．
+
+        ZDD の変数 var * 2 と var * 2 + 1 は隣り合っているので，
+        肯定リテラルの1枝の根が否定リテラルならその0枝に置き換えればよい．
+        """
+        store = self._store
+        index_array = store._index_array
+        edge0_array = store._edge0_array
+        edge1_array = store._edge1_array
+        cache_get = self._computed_table.get
+        cache_put = self._computed_table.put
+        task_stack = [(_CALC, edge)]
+        val_stack = []
+        while task_stack:
+            task = task_stack.pop()
+            if task[0] == _NODE2:
+                _, key, top = task
+                e1 = val_stack.pop()
+                e0 = val_stack.pop()
+                result = self.new_node(top, e0, e1)
+                cache_put(key, result)
+                val_stack.append(result)
+                continue
+            _, edge = task
+            if edge <= 1:
+                val_stack.append(edge)
+                continue
+            key = _CONFLICT_OP, edge, 0
+            result = cache_get(key)
+            if result is not None:
+                val_stack.append(result)
+                continue
+            node = edge >> 1
+            index = index_array[node]
+            e0 = edge0_array[node]
+            e1 = edge1_array[node]
+            if index & 1 == 0 and index_array[e1 >> 1] == index + 1:
+                e1 = edge0_array[e1 >> 1]
+            task_stack.append((_NODE2, key, index))
+            task_stack.append((_CALC, e1))
+            task_stack.append((_CALC, e0))
+        return val_stack[0]
+
+    def count_step(self, edge):
+        """edge の表す集合の要素数を数える．
+
+        ノード数に比例した時間で終わる．
+        """
+        store = self._store
+        table = {0: 0}
+        stack = [edge >> 1]
+        while stack:
+            node = stack[-1]
+            if node in table:
+                stack.pop()
+                continue
+            node0 = store.edge0(node) >> 1
+            node1 = store.edge1(node) >> 1
+            pending = False
+            if node1 not in table:
+                stack.append(node1)
+                pending = True
+            if node0 not in table:
+                stack.append(node0)
+                pending = True
+            if pending:
+                continue
+            stack.pop()
+            table[node] = self._count_value(table, store.edge0(node)) \
+                + self._count_value(table, store.edge1(node))
+        return self._count_value(table, edge)
+
+    @staticmethod
+    def _count_value(table, edge):
+        """count_step() の途中結果から枝の値を得る．
+        """
+        if edge <= 1:
+            return edge
+        return table[edge >> 1]
+
+    def size_step(self, edge_list):
+        """edge_list の根から到達可能なノード数を数える．
+        """
+        store = self._store
+        mark = set()
+        stack = [edge >> 1 for edge in edge_list]
+        while stack:
+            node = stack.pop()
+            if node == 0 or node in mark:
+                continue
+            mark.add(node)
+            stack.append(store.edge1(node) >> 1)
+            stack.append(store.edge0(node) >> 1)
+        return len(mark)
+
+    def iter_cubes_step(self, edge, input_num):
+        """edge の表す集合のキューブを列挙する．
+
+        :param int edge: 根の枝
+        :param int input_num: キューブの入力数
+        :return: Cube を生成するジェネレータを返す．
+        """
+        store = self._store
+        # 各要素は (枝, キューブのリテラルのリスト)
+        stack = [(edge, [Bool3._d] * input_num)]
+        while stack:
+            edge, lits = stack.pop()
+            if edge == 0:
+                continue
+            if edge == 1:
+                yield Cube(lits)
+                continue
+            node = edge >> 1
+            index = store.index(node)
+            lits1 = list(lits)
+            if index & 1:
+                lits1[index >> 1] = Bool3._0
+            else:
+                lits1[index >> 1] = Bool3._1
+            # 0枝側を先にたどるように逆順に積む．
+            stack.append((store.edge1(node), lits1))
+            stack.append((store.edge0(node), lits))
+
+    def new_node(self, index, edge0, edge1):
+        """ノードを生成する．
+
+        1枝が空集合の場合はノードを作らない．
+        """
+        if edge1 == 0:
+            return edge0
+        return self._store.new_node(index, edge0, edge1)
+
+    def _safe_point(self):
+        """必要ならガーベージコレクションを行う．
+
+        演算の開始時に呼ばれる．
+        """
+        if self._store.dead_num >= self._gc_threshold:
+            self.garbage_collection()
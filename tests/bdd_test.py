@@ -7,8 +7,9 @@
 :copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
 """
 
+import io
 import pytest
-from logictools import BddMgr, Bdd
+from logictools import BddMgr, Bdd, Cube
 
 
 def test_BddMgr_zero():
@@ -293,3 +294,568 @@ def test_Bdd_copy_constructor2():
     bdd2 = mgr.copy(bdd1)
 
     assert bdd == bdd2
+
+def test_BddMgr_cache_size():
+    mgr = BddMgr(cache_size=100)
+
+    assert mgr.cache_size == 128
+
+    mgr.set_cache_size(1000)
+
+    assert mgr.cache_size == 1024
+
+def test_BddMgr_computed_table():
+    mgr = BddMgr()
+
+    lits = [mgr.posi_literal(i) for i in range(6)]
+    f = mgr.one()
+    for lit in lits:
+        f &= lit
+    g = mgr.zero()
+    for lit in lits:
+        g |= lit
+
+    # 同じ演算を繰り返した場合はキャッシュにヒットする．
+    table = mgr.computed_table
+    hit_num = table.hit_num
+    h1 = f ^ g
+    h2 = f ^ g
+    assert h1 == h2
+    assert table.hit_num > hit_num
+
+def test_BddMgr_computed_table_small():
+    mgr1 = BddMgr(cache_size=1)
+    mgr2 = BddMgr()
+
+    f1 = mgr1.from_truth("0110100110010110")
+    g1 = mgr1.from_truth("0001011101111111")
+    f2 = mgr2.from_truth("0110100110010110")
+    g2 = mgr2.from_truth("0001011101111111")
+
+    # キャッシュが溢れても結果は変わらない．
+    assert mgr2.copy(f1 & g1) == f2 & g2
+    assert mgr2.copy(f1 | g1) == f2 | g2
+    assert mgr2.copy(f1 ^ g1) == f2 ^ g2
+
+def test_BddMgr_ite():
+    mgr = BddMgr()
+
+    f = mgr.from_truth("0110100110010110")
+    g = mgr.from_truth("0001011101111111")
+    h = mgr.from_truth("1000000011110001")
+    x = mgr.posi_literal(1)
+
+    assert mgr.ite(f, g, h) == (f & g) | (~f & h)
+    assert mgr.ite(~f, g, h) == mgr.ite(f, h, g)
+    assert mgr.ite(f, ~g, ~h) == ~mgr.ite(f, g, h)
+    assert mgr.ite(x, g, h) == (x & g) | (~x & h)
+    assert mgr.ite(f, g, mgr.zero()) == f & g
+    assert mgr.ite(f, mgr.one(), g) == f | g
+    assert mgr.ite(f, ~g, g) == f ^ g
+    assert mgr.ite(f, f, g) == f | g
+    assert mgr.ite(f, g, g) == g
+    assert mgr.ite(mgr.one(), g, h) == g
+    assert mgr.ite(mgr.zero(), g, h) == h
+
+def test_BddMgr_xnor_op():
+    mgr = BddMgr()
+
+    f = mgr.from_truth("0110100110010110")
+    g = mgr.from_truth("0001011101111111")
+
+    assert mgr.xnor_op(f, g) == ~(f ^ g)
+    assert mgr.xnor_op(f, f).is_one()
+
+def test_BddMgr_imp_op():
+    mgr = BddMgr()
+
+    f = mgr.from_truth("0110100110010110")
+    g = mgr.from_truth("0001011101111111")
+
+    assert mgr.imp_op(f, g) == ~f | g
+    assert mgr.imp_op(f & g, f).is_one()
+    assert mgr.imp_op(mgr.zero(), g).is_one()
+
+def test_BddMgr_ite_cache():
+    mgr = BddMgr()
+
+    f = mgr.from_truth("0110100110010110")
+    g = mgr.from_truth("0001011101111111")
+    h1 = f & g
+
+    # 異なる演算でも同じ関数になる場合は同じエントリを用いる．
+    table = mgr.computed_table
+    miss_num = table.find_num - table.hit_num
+    h2 = ~(~f | ~g)
+    h3 = ~mgr.imp_op(g, ~f)
+    h4 = mgr.ite(g, f, mgr.zero())
+    assert h1 == h2
+    assert h1 == h3
+    assert h1 == h4
+    assert table.find_num - table.hit_num == miss_num
+
+def test_BddMgr_store():
+    mgr = BddMgr()
+
+    lit1 = mgr.posi_literal(0)
+    lit2 = mgr.nega_literal(0)
+    lit3 = mgr.literal(0)
+
+    # 同じ関数は同じノードで表される．
+    assert mgr.store.node_num == 1
+    assert lit1 == lit3
+    assert lit1 == ~lit2
+
+    bdd = mgr.from_truth("0110")
+    bdd1 = mgr.posi_literal(0) ^ mgr.posi_literal(1)
+
+    assert bdd == bdd1
+    assert mgr.store.node_num == 3
+
+def test_BddMgr_garbage_collection():
+    mgr = BddMgr()
+
+    lits = [mgr.posi_literal(i) for i in range(8)]
+    f = lits[0] & lits[1]
+    node_num = mgr.store.node_num
+
+    # 中間結果を作って捨てる．
+    for i in range(10):
+        tmp = mgr.zero()
+        for lit in lits:
+            tmp ^= lit
+        del tmp
+    assert mgr.dead_num > 0
+
+    n = mgr.garbage_collection()
+    assert n > 0
+    assert mgr.dead_num == 0
+    assert mgr.store.node_num == node_num
+
+    # 生きている BDD は壊れていない．
+    assert f == mgr.from_truth("1000")
+
+    # 回収後も同じ演算ができる．
+    g = lits[0] ^ lits[1]
+    assert g == mgr.from_truth("0110")
+
+def test_BddMgr_gc_threshold():
+    mgr = BddMgr(gc_threshold=10)
+
+    assert mgr.gc_threshold == 10
+
+    lits = [mgr.posi_literal(i) for i in range(8)]
+    exp = mgr.zero()
+    for lit in lits:
+        exp ^= lit
+    exp = ~exp
+    for i in range(20):
+        f = mgr.one()
+        for lit in lits:
+            f ^= lit
+        assert f == exp
+        assert mgr.dead_num < 10 + 8
+
+    mgr.set_gc_threshold(100)
+    assert mgr.gc_threshold == 100
+
+def make_pair_sop(mgr, n):
+    """x_0 x_n + x_1 x_{n+1} + ... を作る．"""
+    lits = [mgr.posi_literal(i) for i in range(n * 2)]
+    f = mgr.zero()
+    for i in range(n):
+        f |= lits[i] & lits[i + n]
+    return f
+
+def test_BddMgr_var_order():
+    mgr = BddMgr()
+
+    f = make_pair_sop(mgr, 2)
+
+    assert mgr.var_num == 4
+    assert mgr.var_order == [0, 1, 2, 3]
+    for var in range(4):
+        assert mgr.var_to_level(var) == var
+        assert mgr.level_to_var(var) == var
+
+def test_BddMgr_swap_level():
+    mgr = BddMgr()
+
+    f = make_pair_sop(mgr, 3)
+    mgr2 = BddMgr()
+    f2 = mgr2.copy(f)
+
+    mgr.swap_level(2)
+
+    assert mgr.var_order == [0, 1, 3, 2, 4, 5]
+    assert mgr.var_to_level(3) == 2
+    assert mgr.level_to_var(3) == 2
+
+    # 関数は変わらない．
+    assert mgr2.copy(f) == f2
+    assert mgr.copy(f2) == f
+
+    g = f & mgr.posi_literal(2)
+    g2 = f2 & mgr2.posi_literal(2)
+    assert mgr2.copy(g) == g2
+
+def test_BddMgr_reorder():
+    mgr = BddMgr()
+
+    f = make_pair_sop(mgr, 5)
+    mgr.garbage_collection()
+    node_num = mgr.store.node_num
+
+    mgr2 = BddMgr()
+    f2 = mgr2.copy(f)
+
+    new_num = mgr.reorder()
+
+    assert new_num < node_num
+    assert mgr.store.node_num == new_num
+    assert mgr2.copy(f) == f2
+
+def test_BddMgr_auto_reorder():
+    mgr1 = BddMgr()
+    mgr2 = BddMgr(auto_reorder=True, reorder_threshold=50)
+
+    assert not mgr1.auto_reorder
+    assert mgr2.auto_reorder
+
+    f1 = make_pair_sop(mgr1, 6)
+    f2 = make_pair_sop(mgr2, 6)
+    mgr1.garbage_collection()
+    mgr2.garbage_collection()
+
+    assert mgr2.var_order != mgr1.var_order
+    assert mgr2.store.node_num < mgr1.store.node_num
+    assert mgr1.copy(f2) == f1
+
+def test_BddMgr_deep():
+    # 再帰呼び出しの深さの上限を超えるような深いBDDを作る．
+    n = 3000
+    mgr = BddMgr()
+
+    f = mgr.one()
+    for i in range(n - 1, -1, -1):
+        f &= mgr.posi_literal(i)
+    g = mgr.zero()
+    for i in range(n - 1, -1, -1):
+        g |= mgr.nega_literal(i)
+
+    assert f == ~g
+    assert (f ^ g).is_one()
+
+    mgr2 = BddMgr()
+    f2 = mgr2.copy(f)
+    assert mgr.copy(f2) == f
+
+def test_BddMgr_exists():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    assert mgr.exists(f, [0]) == x1 | x2
+    assert f.exists([0]) == x1 | x2
+    assert f.exists([1]) == x0 | x2
+    assert f.exists([0, 1, 2]).is_one()
+    assert f.exists([]) == f
+    assert (x0 & ~x0).exists([0]).is_zero()
+
+def test_BddMgr_forall():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    assert mgr.forall(f, [0]) == x1 & x2
+    assert f.forall([0]) == x1 & x2
+    assert f.forall([1]) == ~x0 & x2
+    assert f.forall([0, 1, 2]).is_zero()
+    assert (x0 | ~x0).forall([0]).is_one()
+
+def test_BddMgr_and_exists():
+    mgr = BddMgr()
+
+    f = mgr.from_truth("0110100110010110")
+    g = mgr.from_truth("0001011101111111")
+    h = mgr.from_truth("1000000011110001")
+
+    for var_list in ([], [0], [1, 3], [0, 1, 2, 3]):
+        assert mgr.and_exists(f, g, var_list) == (f & g).exists(var_list)
+        assert mgr.and_exists(g, h, var_list) == (g & h).exists(var_list)
+        assert mgr.and_exists(f, ~f, var_list).is_zero()
+
+def test_Bdd_compose():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    x3 = mgr.posi_literal(3)
+    f = (x0 & x1) | (~x0 & x2)
+
+    assert f.compose(0, x3) == (x3 & x1) | (~x3 & x2)
+    assert f.compose(0, mgr.one()) == x1
+    assert f.compose(0, mgr.zero()) == x2
+    assert f.compose(1, x2) == x2
+    assert f.compose(3, x0) == f
+    assert mgr.compose(f, 2, ~x1) == x0 & x1 | ~x0 & ~x1
+
+def test_Bdd_vector_compose():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    # 同時に置き換えるので x0 と x1 の入れ替えになる．
+    assert f.vector_compose({0: x1, 1: x0}) == (x1 & x0) | (~x1 & x2)
+    assert f.vector_compose({0: x1 ^ x2, 2: x1}) == x1
+    assert mgr.vector_compose(f, {}) == f
+
+    # 他のマネージャの関数も使える．
+    mgr2 = BddMgr()
+    y0 = mgr2.posi_literal(0)
+    assert f.vector_compose({1: y0, 2: y0}) == x0
+
+def test_Bdd_sat_count():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    assert f.sat_count() == 4
+    assert (~f).sat_count() == 4
+    assert (x0 & x1).sat_count() == 2
+    assert (x0 | x1).sat_count(2) == 3
+    assert (x0 | x1).sat_count(10) == 3 << 8
+    assert mgr.zero().sat_count(3) == 0
+    assert mgr.one().sat_count(3) == 8
+
+    f = mgr.from_truth("0110100110010110")
+    assert f.sat_count() == 8
+
+def test_Bdd_sat_count_large():
+    # 多倍長整数で正確に数える．
+    n = 200
+    mgr = BddMgr()
+
+    f = mgr.zero()
+    for i in range(0, n, 2):
+        f |= mgr.posi_literal(i) & mgr.posi_literal(i + 1)
+
+    # 全ての組が 0 になる割当は 3^(n/2) 通り
+    assert f.sat_count() == (1 << n) - 3 ** (n // 2)
+
+def test_Bdd_sat_one():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = x0 & ~x1 & x2
+
+    assert f.sat_one() == Cube("101")
+    assert (x0 & ~x0).sat_one() is None
+    assert mgr.one().sat_one() == Cube("---")
+
+def test_Bdd_iter_sat():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    cube_list = list(f.iter_sat())
+    assert cube_list == [Cube("0-1"), Cube("11-")]
+
+    minterm_list = sorted(f.iter_sat(minterm=True))
+    assert minterm_list == [[0, 0, 1], [0, 1, 1], [1, 1, 0], [1, 1, 1]]
+
+    # 必要になるまで列挙しない．
+    g = mgr.one()
+    for i in range(3, 60):
+        g &= mgr.posi_literal(i) | mgr.posi_literal(i + 1)
+    it = g.iter_sat(minterm=True)
+    assert len(next(it)) == 61
+
+def test_BddMgr_node_num():
+    mgr = BddMgr()
+
+    assert mgr.node_num == 0
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    f = x0 & x1
+
+    assert mgr.node_num == 3
+
+def test_Bdd_size():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+    g = x1 & x2
+
+    assert mgr.zero().size() == 0
+    assert x0.size() == 1
+    assert f.size() == 3
+    assert g.size() == 2
+    # x2 のノードは共有されている．
+    assert mgr.shared_size([f, g]) == 4
+    assert mgr.shared_size([f, ~f]) == 3
+
+    # 深いBDDでも線形時間で数える．
+    h = mgr.one()
+    for i in range(1999, -1, -1):
+        h &= mgr.posi_literal(i)
+    assert h.size() == 2000
+
+def test_Bdd_support():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x3 = mgr.posi_literal(3)
+    f = (x3 & x1) | x0
+
+    assert f.support() == [0, 1, 3]
+    assert mgr.one().support() == []
+    assert (x1 ^ x3).support() == [1, 3]
+
+    mgr.set_var_order([3, 2, 1, 0])
+    assert f.support() == [0, 1, 3]
+
+def test_BddMgr_level_profile():
+    mgr = BddMgr()
+
+    n = 4
+    f = make_pair_sop(mgr, n)
+    mgr.garbage_collection()
+
+    # x_i と x_{n+i} が離れた変数順なのでノード数が多くなる．
+    profile1 = mgr.level_profile([f])
+    assert len(profile1) == 2 * n
+    assert sum(profile1) == f.size()
+    assert profile1[0] == 1
+    assert profile1[n - 1] == 1 << (n - 1)
+    assert mgr.level_profile() == profile1
+
+    order = []
+    for i in range(n):
+        order.append(i)
+        order.append(n + i)
+    mgr.set_var_order(order)
+    profile2 = mgr.level_profile([f])
+    assert profile2 == [1, 1] * n
+
+def test_BddMgr_dump_load():
+    mgr = BddMgr()
+
+    f = mgr.from_truth("0110100110010110")
+    g = mgr.from_truth("0001011101111111")
+    bdd_list = [f, g, ~f, mgr.one()]
+
+    fout = io.BytesIO()
+    mgr.dump(bdd_list, fout, var_names=["a", "b", "c", "d"])
+
+    mgr2 = BddMgr()
+    bdd_list2, var_names = mgr2.load(io.BytesIO(fout.getvalue()))
+
+    assert var_names == ["a", "b", "c", "d"]
+    assert len(bdd_list2) == 4
+    for bdd, bdd2 in zip(bdd_list, bdd_list2):
+        assert mgr.copy(bdd2) == bdd
+    # 共有されているノードは一度だけ作られる．
+    assert mgr2.shared_size(bdd_list2) == mgr.shared_size(bdd_list)
+    assert mgr2.var_order == mgr.var_order
+
+def test_BddMgr_load_mmap(tmp_path):
+    mgr = BddMgr()
+
+    f = make_pair_sop(mgr, 4)
+    mgr.set_var_order([0, 4, 1, 5, 2, 6, 3, 7])
+    path = tmp_path / "f.bdd"
+    with open(path, "wb") as fout:
+        mgr.dump([f], fout)
+
+    mgr2 = BddMgr()
+    with open(path, "rb") as fin:
+        bdd_list, var_names = mgr2.load(fin, use_mmap=True)
+
+    assert var_names == []
+    assert mgr2.var_order == mgr.var_order
+    assert mgr.copy(bdd_list[0]) == f
+
+    # 変数順の異なるマネージャにも読み込める．
+    mgr3 = BddMgr()
+    mgr3.set_var_order(list(range(7, -1, -1)))
+    x0 = mgr3.posi_literal(0)
+    with open(path, "rb") as fin:
+        bdd_list, _ = mgr3.load(fin, use_mmap=True)
+    assert mgr.copy(bdd_list[0]) == f
+
+def test_BddMgr_load_bad():
+    mgr = BddMgr()
+
+    with pytest.raises(ValueError):
+        mgr.load(io.BytesIO(b"ABCD" + bytes(20)))
+    with pytest.raises(ValueError):
+        mgr.load(io.BytesIO(b"LTBD"))
+
+def test_Bdd_isop():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    cover = f.isop()
+    assert sorted(cover.cube_list) == sorted([Cube("0-1"), Cube("11-")])
+    assert mgr.zero().isop().cube_num == 0
+    assert mgr.one().isop().cube_list == [Cube("---")]
+
+def test_Bdd_isop_dc():
+    mgr = BddMgr()
+
+    x0 = mgr.posi_literal(0)
+    x1 = mgr.posi_literal(1)
+    x2 = mgr.posi_literal(2)
+    on = x0 & x1 & x2
+    dc = x0 & ~(x1 & x2)
+
+    # ドントケアを使って x0 一つにまとめられる．
+    cover = on.isop(on | dc)
+    assert cover.cube_list == [Cube("1--")]
+    assert mgr.isop(on, on | dc).cube_list == [Cube("1--")]
+
+    with pytest.raises(ValueError):
+        (on | dc).isop(on)
+
+def test_Bdd_isop_large():
+    n = 40
+    mgr = BddMgr()
+
+    order = []
+    for i in range(n):
+        order.append(i)
+        order.append(n + i)
+    mgr.set_var_order(order)
+    f = make_pair_sop(mgr, n)
+    cover = f.isop()
+
+    assert cover.cube_num == n
+    assert cover.literal_num == 2 * n
@@ -9,7 +9,8 @@ BoolFunc のテストプログラム
 """
 
 import pytest
-from logictools import BoolFunc, Bool3
+from logictools import BoolFunc, Bool3, Cube
+import logictools.qm as qm
 
 
 def test_BoolFunc_init1():
@@ -132,3 +133,26 @@ def test_BoolFunc_from_string():
     assert f.input_num == 4
     assert f.val([1, 1, 0, 0]) == Bool3._1
     assert f.val([0, 0, 1, 1]) == Bool3._0
+
+
+def test_BoolFunc_gen_primes1():
+    f = BoolFunc("0111")
+
+    assert f.gen_primes() == sorted([Cube("1-"), Cube("-1")])
+
+
+def test_BoolFunc_gen_primes2():
+    # 入力数の多い関数は BDD/ZDD を用いて求めるが結果は変わらない．
+    tv_str = "".join("01d1"[(p * 7 + (p >> 3)) % 4] for p in range(128))
+    f = BoolFunc(tv_str)
+    assert f.input_num > qm.IMPLICIT_THRESHOLD
+
+    on, dc, off = f.gen_minterm_list()
+    primes = f.gen_primes()
+    assert primes == qm.gen_primes(on + dc)
+
+    # 小さな関数で Quine-McCluskey 法と比較する．
+    g = BoolFunc(tv_str[:32])
+    on, dc, off = g.gen_minterm_list()
+    truth_str = "".join("0" if c == "0" else "1" for c in reversed(tv_str[:32]))
+    assert qm.gen_primes_implicit(truth_str) == qm.gen_primes(on + dc)
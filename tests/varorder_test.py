@@ -0,0 +1,87 @@
+#! /usr/bin/env python3
+
+"""varorder のテストプログラム
+
+:file: varorder_test.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+import pytest
+from logictools import BddMgr, Cube, Cover
+from logictools.bdd import varorder
+
+
+var_map = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5}
+expr_str = 'a * d + b * e + c * f'
+
+
+def test_dfs_order():
+    order = varorder.dfs_order(expr_str, var_map)
+
+    assert order == [0, 3, 1, 4, 2, 5]
+
+def test_dfs_order2():
+    # 深い部分式を先にたどる．
+    order = varorder.dfs_order('f + (a ^ (b * c))', var_map)
+
+    assert order == [1, 2, 0, 5, 3, 4]
+
+def test_force_order():
+    edge_list = varorder.expr_hyperedges(expr_str, var_map)
+    order = varorder.force_order(edge_list, [0, 1, 2, 3, 4, 5])
+
+    # 積項の変数が隣り合う．
+    for x, y in [(0, 3), (1, 4), (2, 5)]:
+        assert abs(order.index(x) - order.index(y)) == 1
+
+def test_expr_order():
+    order1 = varorder.expr_order(expr_str, var_map)
+    order2 = varorder.expr_order(expr_str, var_map, method='force')
+
+    assert sorted(order1) == list(range(6))
+    assert sorted(order2) == list(range(6))
+
+    with pytest.raises(ValueError):
+        varorder.expr_order(expr_str, var_map, method='foo')
+
+def test_cover_order():
+    cover = Cover([Cube('1--1'), Cube('-11-'), Cube('0---')])
+
+    order = varorder.cover_order(cover)
+    assert order == [0, 3, 1, 2]
+
+    order = varorder.cover_order(cover, method='force')
+    assert sorted(order) == [0, 1, 2, 3]
+
+def test_fsm_order():
+    input_map = {'0': (0, ), '1': (1, )}
+    state_map = {'s0': (0, 0), 's1': (0, 1), 's2': (1, 0)}
+
+    order = varorder.fsm_order(input_map=input_map, state_map=state_map)
+
+    assert order == [2, 0, 3, 1, 4]
+
+def test_set_var_order():
+    mgr1 = BddMgr()
+    mgr2 = BddMgr()
+
+    # ノードを作る前に変数順を決める．
+    mgr2.set_var_order(varorder.dfs_order(expr_str, var_map))
+    assert mgr2.var_order == [0, 3, 1, 4, 2, 5]
+
+    f1 = mgr1.zero()
+    f2 = mgr2.zero()
+    for x, y in [(0, 3), (1, 4), (2, 5)]:
+        f1 |= mgr1.posi_literal(x) & mgr1.posi_literal(y)
+        f2 |= mgr2.posi_literal(x) & mgr2.posi_literal(y)
+    mgr1.garbage_collection()
+    mgr2.garbage_collection()
+
+    assert mgr2.store.node_num < mgr1.store.node_num
+    assert mgr1.copy(f2) == f1
+
+    # ノードがある状態で変数順を変える．
+    mgr1.set_var_order([0, 3, 1, 4, 2, 5])
+    assert mgr1.var_order == [0, 3, 1, 4, 2, 5]
+    assert mgr1.copy(f2) == f1
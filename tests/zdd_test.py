@@ -0,0 +1,172 @@
+#! /usr/bin/env python3
+
+"""Zdd, ZddMgr のテストプログラム
+
+:file: zdd_test.py
+:author: Yusuke Matsunaga (松永 裕介)
+:copyright: Copyright (C) 2022 Yusuke Matsunaga, All rights reserved.
+"""
+
+import pytest
+from logictools import ZddMgr, Zdd, BddMgr, Cube, Cover
+
+
+def make_cover(str_list):
+    return Cover([Cube(s) for s in str_list])
+
+def cube_set(zdd, input_num):
+    return {str(cube) for cube in zdd.iter_cubes(input_num)}
+
+def test_ZddMgr_zero():
+    mgr = ZddMgr()
+
+    zdd = mgr.zero()
+    assert zdd.is_zero()
+    assert not zdd.is_one()
+    assert zdd.cube_num == 0
+
+def test_ZddMgr_one():
+    mgr = ZddMgr()
+
+    zdd = mgr.one()
+    assert not zdd.is_zero()
+    assert zdd.is_one()
+    assert zdd.cube_num == 1
+    assert list(zdd.iter_cubes(2)) == [Cube("--")]
+
+def test_ZddMgr_literal():
+    mgr = ZddMgr()
+
+    zdd1 = mgr.literal(1)
+    zdd2 = mgr.literal(1, True)
+    assert zdd1 != zdd2
+    assert list(zdd1.iter_cubes(3)) == [Cube("-1-")]
+    assert list(zdd2.iter_cubes(3)) == [Cube("-0-")]
+
+def test_ZddMgr_from_cover():
+    mgr = ZddMgr()
+
+    cover = make_cover(["1-0", "01-", "--1", "1-0"])
+    zdd = mgr.from_cover(cover)
+
+    # 重複したキューブは一つになる．
+    assert zdd.cube_num == 3
+    assert cube_set(zdd, 3) == {str(Cube(s)) for s in ["1-0", "01-", "--1"]}
+    assert zdd == mgr.from_cube(Cube("1-0")) | mgr.from_cube(Cube("01-")) \
+        | mgr.from_cube(Cube("--1"))
+
+def test_Zdd_set_ops():
+    mgr = ZddMgr()
+
+    f = mgr.from_cover(make_cover(["1-0", "01-", "--1"]))
+    g = mgr.from_cover(make_cover(["01-", "11-", "--1", "000"]))
+
+    assert cube_set(f | g, 3) == \
+        {str(Cube(s)) for s in ["1-0", "01-", "--1", "11-", "000"]}
+    assert cube_set(f & g, 3) == {str(Cube(s)) for s in ["01-", "--1"]}
+    assert cube_set(f - g, 3) == {str(Cube(s)) for s in ["1-0"]}
+    assert (f - f).is_zero()
+    assert f & mgr.zero() == mgr.zero()
+
+    h = mgr.from_cover(make_cover(["1-0"]))
+    h |= g
+    assert h == f | g
+    h &= f
+    assert h == f & (f | g)
+    h -= f
+    assert h.is_zero()
+
+def test_Zdd_product():
+    mgr = ZddMgr()
+
+    f = mgr.from_cover(make_cover(["1--", "-0-"]))
+    g = mgr.from_cover(make_cover(["0--", "--1"]))
+
+    # 1-- * 0-- は矛盾するので取り除かれる．
+    assert cube_set(f * g, 3) == {str(Cube(s)) for s in ["1-1", "00-", "-01"]}
+    assert f * mgr.one() == f
+    assert (f * mgr.zero()).is_zero()
+
+    h = mgr.from_cover(make_cover(["1--"]))
+    h *= g
+    assert cube_set(h, 3) == {str(Cube("1-1"))}
+
+def test_Zdd_to_cover():
+    mgr = ZddMgr()
+
+    cover = make_cover(["1-0", "01-", "--1"])
+    zdd = mgr.from_cover(cover)
+    cover2 = zdd.to_cover(3)
+
+    assert cover2.cube_num == 3
+    assert sorted(cover2.cube_list) == sorted(cover.cube_list)
+
+def test_Zdd_large():
+    # 全ての最小項の集合をキューブを列挙せずに作る．
+    n = 40
+    mgr = ZddMgr()
+
+    zdd = mgr.one()
+    for i in range(n):
+        zdd *= mgr.literal(i) | mgr.literal(i, True)
+
+    assert zdd.cube_num == 1 << n
+    assert zdd.size() == 2 * n
+
+def test_ZddMgr_garbage_collection():
+    mgr = ZddMgr(gc_threshold=4)
+
+    f = mgr.from_cover(make_cover(["1-0", "01-", "--1"]))
+    for _ in range(10):
+        g = f * mgr.from_cover(make_cover(["-1-", "0--"]))
+    node_num = mgr.node_num
+    assert mgr.garbage_collection() > 0
+
+    assert mgr.node_num < node_num
+    assert mgr.node_num <= f.size() + g.size()
+    assert cube_set(f, 3) == {str(Cube(s)) for s in ["1-0", "01-", "--1"]}
+
+def test_ZddMgr_primes():
+    bdd_mgr = BddMgr()
+    mgr = ZddMgr()
+
+    x0 = bdd_mgr.posi_literal(0)
+    x1 = bdd_mgr.posi_literal(1)
+    x2 = bdd_mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    primes = mgr.primes(f)
+    assert cube_set(primes, 3) == {str(Cube(s)) for s in ["11-", "0-1", "-11"]}
+
+    # ドントケアを含む場合
+    primes = mgr.primes(x0 & x1, x0 & ~x1)
+    assert cube_set(primes, 3) == {str(Cube("1--"))}
+
+    assert mgr.primes(bdd_mgr.zero()).is_zero()
+    assert mgr.primes(bdd_mgr.one()).is_one()
+
+def test_ZddMgr_primes_reorder():
+    # BDD の変数順が変数番号の順と異なっていてもよい．
+    bdd_mgr = BddMgr()
+    bdd_mgr.set_var_order([2, 0, 1])
+    mgr = ZddMgr()
+
+    x0 = bdd_mgr.posi_literal(0)
+    x1 = bdd_mgr.posi_literal(1)
+    x2 = bdd_mgr.posi_literal(2)
+    f = (x0 & x1) | (~x0 & x2)
+
+    primes = mgr.primes(f)
+    assert cube_set(primes, 3) == {str(Cube(s)) for s in ["11-", "0-1", "-11"]}
+
+def test_ZddMgr_primes_large():
+    # 主項の数は 2^n だが列挙せずに求める．
+    n = 30
+    bdd_mgr = BddMgr()
+    mgr = ZddMgr()
+
+    f = bdd_mgr.one()
+    for i in range(n - 1, -1, -1):
+        f &= bdd_mgr.posi_literal(2 * i) | bdd_mgr.posi_literal(2 * i + 1)
+    primes = mgr.primes(f)
+    assert primes.cube_num == 2 ** n